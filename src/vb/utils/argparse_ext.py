@@ -13,8 +13,8 @@ class StoreTrueCondAction(argparse._StoreTrueAction):
     it can make other options (not) required.
 
     Attributes:
-        make_required: List of options that will be changed to required
-        make_not_required: List of options that will be changed to not
+        make_required: Tuple of options that will be changed to required
+        make_not_required: Tuple of options that will be changed to not
             required
 
     Example:
@@ -61,8 +61,8 @@ class StoreTrueCondAction(argparse._StoreTrueAction):
         _make_required = kwargs.pop('make_required', [])
         _make_not_required = kwargs.pop('make_not_required', [])
         super().__init__(option_strings, dest, **kwargs)
-        self.make_required = _make_required
-        self.make_not_required = _make_not_required
+        self.make_required = tuple(_make_required)
+        self.make_not_required = tuple(_make_not_required)
 
     def __call__(self, parser, namespace, values, option_string=None):
         """Execute the action."""
@@ -70,10 +70,8 @@ class StoreTrueCondAction(argparse._StoreTrueAction):
             required.required = True
         for not_required in self.make_not_required:
             not_required.required = False
-        try:
-            return super().__call__(parser, namespace, values, option_string)
-        except NotImplementedError:
-            pass
+        # Same as _StoreConstAction.__call__() without the extra call.
+        setattr(namespace, self.dest, self.const)
 
 
 def add_common_arguments(
@@ -2,15 +2,100 @@
 
 The configuration file template is normally put in `config_default.yaml` inside
 the module directory.
+
+The module `confuse` (and with it `yaml`) is imported only when a `Config`
+object is created so importing this module is cheap.
 """
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
 import os
+import pickle
+import shutil
 import sys
-from typing import TextIO
+import tempfile
+import types
+from typing import IO, TYPE_CHECKING, Any, TextIO, cast
+
+if TYPE_CHECKING:
+    import confuse
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader() -> type[confuse.Loader]:
+    """Return the YAML loader class used for reading the configuration.
+
+    If PyYAML is built with the LibYAML bindings, a loader based on
+    `yaml.CSafeLoader` with the confuse specific constructors is returned.
+    Parsing is then done by the C extension, which is many times faster.
+    Otherwise the pure Python `confuse.Loader` is returned.
+
+    LibYAML rejects some documents which `confuse.Loader` accepts (e.g.
+    unquoted strings starting with `%` like `fmt: %Y-%m-%d`). Such
+    documents are parsed again by `confuse.Loader`.
+
+    Examples:
+        >>> import yaml
+        >>> yaml.load('fmt: %Y-%m-%d', Loader=_yaml_loader())['fmt']
+        '%Y-%m-%d'
+    """
+    import confuse
+    import yaml
+
+    try:
+        from yaml import CSafeLoader
+    except ImportError:                 # PyYAML without LibYAML bindings
+        return confuse.Loader
+
+    class CLoader(CSafeLoader):         # pylint: disable=too-many-ancestors
+        """Confuse YAML loader based on LibYAML."""
 
-import confuse
+        def __init__(self, stream: str | bytes | IO[Any]) -> None:
+            # Keep the whole document for the fallback parsing.
+            if not isinstance(stream, (str, bytes)):
+                stream = stream.read()
+            self._document = stream
+            super().__init__(stream)
+
+        def get_single_data(self) -> Any:
+            try:
+                return super().get_single_data()
+            except yaml.YAMLError:
+                fallback_loader = confuse.Loader(self._document)
+                try:
+                    return fallback_loader.get_single_data()
+                finally:
+                    fallback_loader.dispose()
+
+    # CSafeLoader has the same constructor API as SafeLoader.
+    confuse.Loader.add_constructors(CLoader)    # type: ignore[arg-type]
+    return CLoader                      # type: ignore[return-value]
+
+
+def _to_namespace(value: Any) -> Any:
+    """Convert nested mappings to nested namespaces for fast attribute access.
+
+    Examples:
+        >>> ns = _to_namespace({'a': 1, 'b': {'c': [{'d': 'x'}]}})
+        >>> ns.b.c[0].d
+        'x'
+
+        Mappings with keys which are not strings stay dictionaries:
+
+        >>> _to_namespace({'ports': {80: {'name': 'http'}}}).ports[80].name
+        'http'
+    """
+    if isinstance(value, dict):
+        items = {key: _to_namespace(item) for key, item in value.items()}
+        if all(isinstance(key, str) for key in items):
+            return types.SimpleNamespace(**items)
+        return items
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
 
 
 class Config:
@@ -19,41 +104,144 @@ class Config:
     Attributes:
         config: the basic configuration object
         vconf: the parsed and validated configuration object
+        vconf_frozen: `vconf` converted to nested `types.SimpleNamespace`
+            objects, use it for fast attribute access in hot loops
+            (mappings with non-string keys are kept as dictionaries)
     """
     config: confuse.Configuration
     vconf: confuse.AttrDict
+    vconf_frozen: types.SimpleNamespace
+
+    CACHE_FILENAME = '.conf_cache.pkl'
+    """Name of the validated configuration cache file in user's directory."""
+    CACHE_VERSION = 2
+    """Version of the cache file format, increment it on incompatible change."""
 
     def __init__(
             self, app_name: str | None = None, mod_name: str | None = None,
-            template: dict[str, confuse.Template] | None = None
-            ) -> None:
+            template: dict[str, confuse.Template] | None = None,
+            cache: bool = True) -> None:
         """Initialize the configuration object.
 
+        The configuration files are read lazily. If `cache` is set,
+        the validated configuration is stored to a cache file in the user's
+        configuration directory. The next time the cache is used instead of
+        parsing and validating the configuration files if the files did not
+        change.
+
         Args:
             app_name: application name
             mod_name: module name, this parameter is needed to find the default
                 configuration file `config_default.yaml`
             template: template for validating the configuration
+            cache: use the cache of the validated configuration
 
         Fixme:
             - Make template mandatory?
             - Provide a default for mod_name?
             - Test behavior without app_name.
         """
+        import confuse
+
         if app_name is None:
             app_name = os.path.basename(sys.argv[0])
         self.template = template
-        # self.config = confuse.LazyConfig(app_name, mod_name)
-        self.config = confuse.Configuration(app_name, mod_name)
-        self.validate()
+        self.mod_name = mod_name
+        self.config = confuse.LazyConfig(app_name, mod_name)
+        self.config.loader = _yaml_loader()
+        cache_key = self._cache_key() if cache else None
+        if not (cache_key and self._load_cache(cache_key)):
+            self.validate()
+            if cache_key:
+                self._store_cache(cache_key)
         # self.config.set_file(config_file)
         # self.config.set_args()
 
     def validate(self) -> None:
         """Validate the configuration using the template."""
         vconf = self.config.get(self.template)
-        assert isinstance(vconf, confuse.AttrDict)
+        self._set_vconf(cast('confuse.AttrDict', vconf))
+
+    def _set_vconf(self, vconf: confuse.AttrDict) -> None:
+        """Set the validated configuration and its frozen variant."""
         self.vconf = vconf
+        self.vconf_frozen = _to_namespace(vconf)
+
+    def _cache_key(self) -> tuple[Any, ...] | None:
+        """Get the key identifying the configuration files and template.
+
+        The template is represented by the digest of its pickle because
+        the repr() of the confuse templates does not contain all their
+        parameters.
+
+        Returns:
+            the key or None if the template cannot be pickled (then
+            the cache is not used)
+        """
+        import confuse
+
+        try:
+            template_digest = hashlib.sha256(pickle.dumps(
+                    self.template, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+        except Exception:               # pylint: disable=broad-except
+            return None                 # e.g. a template with a lambda
+
+        paths = [self.get_user_filename()]
+        package_path = (
+                confuse.util.find_package_path(self.mod_name) if self.mod_name
+                else None)
+        if package_path:
+            paths.append(os.path.join(package_path, confuse.DEFAULT_FILENAME))
+        mtimes: list[int | None] = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (
+                tuple(paths), tuple(mtimes), template_digest,
+                confuse.__version__)
+
+    def _load_cache(self, cache_key: tuple[Any, ...]) -> bool:
+        """Load the validated configuration from the cache if it is valid.
+
+        A cache file which cannot be loaded (e.g. written by other versions
+        of the modules) is treated as invalid and it is rewritten later.
+
+        Returns:
+            True if the configuration was loaded from the cache
+        """
+        cache_fname = os.path.join(self.get_user_dirname(), self.CACHE_FILENAME)
+        try:
+            with open(cache_fname, 'rb') as cache_file:
+                version, key, vconf = pickle.load(cache_file)
+        except Exception:               # pylint: disable=broad-except
+            return False
+        if version != self.CACHE_VERSION or key != cache_key:
+            return False
+        self._set_vconf(vconf)
+        return True
+
+    def _store_cache(self, cache_key: tuple[Any, ...]) -> None:
+        """Store the validated configuration to the cache.
+
+        The cache file is replaced atomically. Failures are ignored.
+        """
+        cache_dir = self.get_user_dirname()
+        try:
+            cache_fd, tmp_fname = tempfile.mkstemp(
+                    dir=cache_dir, prefix=self.CACHE_FILENAME)
+        except OSError:
+            return
+        try:
+            with os.fdopen(cache_fd, 'wb') as cache_file:
+                pickle.dump(
+                        (self.CACHE_VERSION, cache_key, self.vconf), cache_file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_fname, os.path.join(cache_dir, self.CACHE_FILENAME))
+        except (OSError, pickle.PickleError, TypeError, AttributeError):
+            with contextlib.suppress(OSError):
+                os.remove(tmp_fname)
 
     def get_user_dirname(self) -> str:
         """Get user's configuration directory name."""
@@ -62,12 +250,18 @@ class Config:
 
     def get_user_filename(self) -> str:
         """Get user's configuration file name."""
+        import confuse
+
         return os.path.join(self.get_user_dirname(), confuse.CONFIG_FILENAME)
         # FIXME: fix upstream: confuse.CONFIG_FILENAME not documented
 
     def write(self, only_new: bool = True) -> None:
         """Save configuration to user's store.
 
+        An existing file is not rewritten if its content would not change.
+        Otherwise it is replaced atomically. If the file is a symlink, its
+        target is replaced.
+
         Args:
             only_new: Write the configuration file only if it does not exist.
 
@@ -82,10 +276,32 @@ class Config:
                 - os.path.join(self._package_path, DEFAULT_FILENAME)
         """
         user_fname = self.get_user_filename()
-        if not only_new or not os.path.exists(user_fname):
+        if only_new and os.path.exists(user_fname):
+            return
+        content = self.config.dump()
+        try:
+            with open(user_fname, encoding='utf-8') as conf_file:
+                if conf_file.read() == content:
+                    return
+        except FileNotFoundError:
             with open(user_fname, 'w', encoding='utf-8') as conf_file:
-                conf_file.write(self.config.dump())
-            # logging.info("Configuration written to %s.", user_fname)
+                conf_file.write(content)
+            return
+        # Replace the target of a symlink, not the symlink itself.
+        real_fname = os.path.realpath(user_fname)
+        conf_fd, tmp_fname = tempfile.mkstemp(
+                dir=os.path.dirname(real_fname),
+                prefix=os.path.basename(real_fname))
+        try:
+            with os.fdopen(conf_fd, 'w', encoding='utf-8') as conf_file:
+                conf_file.write(content)
+            shutil.copymode(real_fname, tmp_fname)
+            os.replace(tmp_fname, real_fname)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_fname)
+            raise
+        # logging.info("Configuration written to %s.", user_fname)
 
     def dbg_print(self, stream: TextIO = sys.stderr) -> None:
         """Print the configuration."""
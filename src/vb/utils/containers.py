@@ -20,7 +20,11 @@ def dict_update_missing(target_dict: dict, source_dict: dict) -> None:
         >>> dict_update_missing(target_dict, source_dict)
         >>> target_dict
         {'a': 1, 'b': 2, 'c': 3}
+
+        >>> dict_update_missing(target_dict, {'e': 5, 'b': 20, 'd': 4})
+        >>> target_dict
+        {'a': 1, 'b': 2, 'c': 3, 'e': 5, 'd': 4}
     """
-    for key, value in source_dict.items():
-        if key not in target_dict:
-            target_dict[key] = value
+    target_dict.update(
+            (key, value) for key, value in source_dict.items()
+            if key not in target_dict)
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-import re
-
+import functools
 from datetime import datetime, timezone, tzinfo
 
 
+_ISO_RELAXED_FIELDS = ((0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19))
+"""Positions of the numeric fields in the relaxed ISO 8601 format."""
+_ISO_RELAXED_LENGTHS = frozenset(end for _, end in _ISO_RELAXED_FIELDS[2:])
+"""Valid lengths of the relaxed ISO 8601 strings (from date to seconds)."""
+
+
 def timezone_from_name(name: str) -> tzinfo | None:
     """Return timezone from name.
 
+    The timezones loaded from the zoneinfo database are cached. The local
+    timezone is not cached because it is a fixed UTC offset valid at
+    the time of the call (it changes e.g. with DST).
+
     Args:
         name: timezone name
             special names: 'UTC', 'local', 'localtime'
@@ -30,13 +39,51 @@ def timezone_from_name(name: str) -> tzinfo | None:
         # alternative: None
         return datetime.now(timezone.utc).astimezone().tzinfo
     else:
-        # For other timezones than UTC and local we need to import module
-        # zoneinfo which is in the standard library since Python 3.10.
-        try:
-            import zoneinfo                 # type: ignore # optional import
-        except ImportError:
-            from backports import zoneinfo  # type: ignore # optional import
-        return zoneinfo.ZoneInfo(name)
+        return _zoneinfo_from_name(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _zoneinfo_from_name(name: str) -> tzinfo:
+    """Return timezone from the zoneinfo database (cached)."""
+    # For other timezones than UTC and local we need to import module
+    # zoneinfo which is in the standard library since Python 3.10.
+    try:
+        import zoneinfo                 # type: ignore # optional import
+    except ImportError:
+        from backports import zoneinfo  # type: ignore # optional import
+    return zoneinfo.ZoneInfo(name)
+
+
+_MAX_TIMESTAMP = 253402300800
+"""The first timestamp after the end of the year 9999 (max. for datetime)."""
+
+
+def _civil_from_days(days: int) -> tuple[int, int, int]:
+    """Return year, month and day from the number of days since 1970-01-01.
+
+    The algorithm civil_from_days by Howard Hinnant uses only integer
+    arithmetic: http://howardhinnant.github.io/date_algorithms.html
+
+    Examples:
+        >>> _civil_from_days(0)
+        (1970, 1, 1)
+
+        >>> _civil_from_days(18157)
+        (2019, 9, 18)
+    """
+    days += 719468                      # shift the epoch to 0000-03-01
+    era = days // 146097                # 400 years periods
+    day_of_era = days - era * 146097
+    year_of_era = (
+            day_of_era - day_of_era // 1460 + day_of_era // 36524
+            - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (
+            365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_from_march = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_from_march + 2) // 5 + 1
+    month = month_from_march + 3 if month_from_march < 10 else month_from_march - 9
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
 
 
 def iso_from_timestamp(
@@ -65,6 +112,17 @@ def iso_from_timestamp(
         ...     1568783600.123456, t_zone=timezone(offset=timedelta(hours=1)))
         '2019-09-18T06:13:20.123456+01:00'
     """
+    if t_zone is timezone.utc:
+        # Fast path for whole seconds in UTC without creating datetime.
+        seconds = int(timestamp)
+        if seconds == timestamp and 0 <= seconds < _MAX_TIMESTAMP:
+            days, seconds = divmod(seconds, 86400)
+            hour, seconds = divmod(seconds, 3600)
+            minute, seconds = divmod(seconds, 60)
+            year, month, day = _civil_from_days(days)
+            return (
+                    f'{year:04d}-{month:02d}-{day:02d}'
+                    f'T{hour:02d}:{minute:02d}:{seconds:02d}+00:00')
     return datetime.fromtimestamp(timestamp, t_zone).isoformat()
 
 
@@ -95,9 +153,21 @@ def hms_from_seconds(
         >>> hms_from_seconds(3743.123456, frac_digits=2)
         '01:02:23.12'
 
+        >>> hms_from_seconds(59.7, omit_significant=1)
+        '01:00'
+
     Todo:
         * Allow the highest order part not to be zero-padded.
     """
+    if not frac_digits:
+        # Fast path using integer arithmetic for whole seconds.
+        hr_int, sec_int = divmod(round(seconds), 3600)
+        mn_int, sec_int = divmod(sec_int, 60)
+        if hr_int or not omit_significant:
+            return f'{hr_int:02d}:{mn_int:02d}:{sec_int:02d}'
+        if mn_int or omit_significant == 1:
+            return f'{mn_int:02d}:{sec_int:02d}'
+        return f'{sec_int:02d}'
     hr, sec = divmod(seconds, 3600)
     mn, sec = divmod(sec, 60)
     time_parts: list[str] = []
@@ -142,18 +212,23 @@ def iso_from_relaxed(iso_like: str) -> str:
         '2019-09-18T05'
         >>> iso_from_relaxed('2019-09-18')
         '2019-09-18'
+        >>> iso_from_relaxed('2019-09-18 05:13:2')
+        Traceback (most recent call last):
+            ...
+        ValueError: Invalid ISO 8601 like format: '2019-09-18 05:13:2'
     """
-    def replace_separators(match: re.Match) -> str:
-        """Replace separators in a date time string."""
-        result = match['date']
-        if match['time']:
-            time = re.sub('-', ':', match['time'])
-            result = f'{result}T{time}'
-        return result
-    iso_datetime, changes_count = re.subn(
-        r'^(?P<date>\d{4}-\d{2}-\d{2})'
-        r'(?:.(?P<time>\d{2}(?:[:-]\d{2}(?:[:-]\d{2})?)?))?$',
-        replace_separators, iso_like)
-    if changes_count:
-        return iso_datetime
+    # The format has fixed layout so it is checked position by position.
+    # Slices beyond the end of the string are empty and `'' in ':-'` is true.
+    length = len(iso_like)
+    if (
+            length in _ISO_RELAXED_LENGTHS
+            and iso_like[4] == iso_like[7] == '-'
+            and iso_like[10:11] != '\n'
+            and iso_like[13:14] in ':-' and iso_like[16:17] in ':-'
+            and all(
+                iso_like[start:end].isdecimal()
+                for start, end in _ISO_RELAXED_FIELDS if end <= length)):
+        if length == 10:
+            return iso_like
+        return f'{iso_like[:10]}T{iso_like[11:].replace("-", ":")}'
     raise ValueError(f'Invalid ISO 8601 like format: {iso_like!r}')
@@ -2,37 +2,467 @@
 
 from __future__ import annotations
 
+import atexit
 import contextlib
 import errno
+import functools
 import gzip
+import io
 import os
 import pathlib
+import re
+import secrets
 import shutil
+import struct
+import sys
 import tempfile
+import threading
 import warnings
-from types import TracebackType
-from typing import Type
+import zipfile
+from types import MappingProxyType, TracebackType
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Type, cast
 
-from . import ppr
+if TYPE_CHECKING:
+    from . import ppr
 
+try:
+    import bz2
+except ImportError:             # Python built without bz2 support
+    bz2 = None                  # type: ignore[assignment]
+try:
+    import lzma
+except ImportError:             # Python built without lzma support
+    lzma = None                 # type: ignore[assignment]
+try:
+    from isal import igzip      # type: ignore # optional import
+except ImportError:
+    igzip = None                # type: ignore[assignment]
+try:
+    import rapidgzip            # type: ignore # optional import
+except ImportError:
+    rapidgzip = None
 
-COMPRESSION_SUFFIXES = {
+
+COMPRESSION_SUFFIXES = MappingProxyType({
         '.gz': 'gzip',
         '.zip': 'zip',
         '.bz2': 'bzip2',
         '.xz': 'xz',
         '.lzma': 'lzma',
+        })
+"""Mapping of compression file suffixes to their types (read-only)."""
+_COMPRESSION_SUFFIXES_LOWER = {
+        suffix.lower(): compression_type
+        for suffix, compression_type in COMPRESSION_SUFFIXES.items()}
+"""Mapping of lowercase compression suffixes for case insensitive lookup."""
+
+BUFFER_SIZE = 1 << 20
+"""Size of the buffers used for reading and copying during decompression."""
+
+GZIP_BACKENDS = {'gzip': gzip}
+"""Available modules for gzip decompression.
+
+The `isal` one is the fastest single-threaded one. The `rapidgzip` one
+decompresses in parallel so it is the fastest for large files.
+"""
+if igzip is not None:
+    GZIP_BACKENDS['isal'] = igzip
+if rapidgzip is not None:
+    GZIP_BACKENDS['rapidgzip'] = rapidgzip
+
+RAPIDGZIP_MIN_SIZE = 50 << 20
+"""Minimal compressed file size to choose `rapidgzip` gzip backend by default.
+
+For smaller files the start of the parallel decompression costs more
+than it saves.
+"""
+
+
+def _rapidgzip_open(file: IO[bytes], mode: str = 'rb') -> IO[bytes]:
+    """Open gzip file using `rapidgzip` with the `open()` signature of gzip."""
+    if mode not in {'r', 'rb'}:
+        raise ValueError(f'Unsupported mode for rapidgzip: {mode!r}')
+    return rapidgzip.open(file)
+
+
+_GZIP_BACKEND_OPENERS: dict[str, Callable[..., IO[bytes]]] = {
+        'rapidgzip': _rapidgzip_open,
+        }
+"""Openers of `GZIP_BACKENDS` whose `open()` has a different signature."""
+
+
+_TMPFS_DIR = '/dev/shm'
+"""Directory on tmpfs (in RAM) preferred for the temporary files."""
+_MOUNTS_FILE = '/proc/mounts'
+"""File listing the mounted file systems (Linux)."""
+_RAM_FILE_SYSTEMS = frozenset({'tmpfs', 'ramfs'})
+"""Types of file systems storing the files in RAM."""
+
+
+def _is_on_tmpfs(path: str) -> bool:
+    """Check if the path is on a file system in RAM (Linux only)."""
+    path = os.path.realpath(path)
+    fs_type = None
+    mount_point_length = -1
+    try:
+        with open(_MOUNTS_FILE, encoding='utf-8') as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # Special characters in the mount point are octal escaped.
+                mount_point = re.sub(
+                        r'\\([0-7]{3})', lambda match: chr(int(match[1], 8)),
+                        fields[1])
+                if (
+                        len(mount_point) > mount_point_length
+                        and (
+                            path == mount_point
+                            or path.startswith(mount_point.rstrip('/') + '/'))):
+                    fs_type = fields[2]
+                    mount_point_length = len(mount_point)
+    except OSError:
+        return False
+    return fs_type in _RAM_FILE_SYSTEMS
+
+
+@functools.lru_cache(maxsize=None)
+def _default_tmpfs_dir() -> str | None:
+    """Get the directory on tmpfs to use instead of the default one.
+
+    Returns:
+        `_TMPFS_DIR` if it is usable and the default temporary directory
+        is not on tmpfs already, otherwise None
+    """
+    if _is_on_tmpfs(tempfile.gettempdir()):
+        return None
+    if (
+            os.path.isdir(_TMPFS_DIR)
+            and os.access(_TMPFS_DIR, os.W_OK | os.X_OK)
+            and _is_on_tmpfs(_TMPFS_DIR)):
+        return _TMPFS_DIR
+    return None
+
+
+def _zip_open(file: IO[bytes], mode: str = 'rb') -> IO[bytes]:
+    """Open the only member of a zip archive for reading."""
+    if mode not in {'r', 'rb'}:
+        raise ValueError(f'Unsupported mode for zip: {mode!r}')
+    with zipfile.ZipFile(file) as archive:
+        names = archive.namelist()
+        if len(names) != 1:
+            raise ValueError(
+                    f'Zip archive has to contain exactly one file, '
+                    f'it contains {len(names)}.')
+        return archive.open(names[0], 'r')
+
+
+_OPENERS: dict[str, Callable[..., IO[bytes]]] = {
+        # The overloads of gzip.open() do not match the common type.
+        'gzip': cast('Callable[..., IO[bytes]]', gzip.open),
+        'zip': _zip_open,
         }
-"""Mapping of compression file suffixes to their types."""
+"""Functions opening a compressed file object for decompressed reading."""
+if bz2 is not None:
+    _OPENERS['bzip2'] = bz2.open
+if lzma is not None:
+    _OPENERS['xz'] = functools.partial(lzma.open, format=lzma.FORMAT_XZ)
+    _OPENERS['lzma'] = functools.partial(lzma.open, format=lzma.FORMAT_ALONE)
+
+
+def _copy_file_object(
+        source: IO[bytes], destination: IO[bytes],
+        length: int = BUFFER_SIZE) -> None:
+    """Copy binary file object data using a single reusable buffer.
+
+    Unlike `shutil.copyfileobj()` which allocates new bytes for every read,
+    `readinto()` fills the same buffer again and again. The generic
+    `io.BufferedIOBase.readinto()` calls `read()` and copies the data so
+    `shutil.copyfileobj()` is used for classes which do not override it
+    (e.g. `gzip.GzipFile` in Python 3.11).
+    """
+    if getattr(type(source), 'readinto', None) in (
+            None, io.BufferedIOBase.readinto):
+        shutil.copyfileobj(source, destination, length)
+        return
+    # IO[bytes] does not declare readinto() though the binary files have it.
+    readinto = cast('io.BufferedIOBase', source).readinto
+    with memoryview(bytearray(length)) as buffer:
+        while True:
+            size = readinto(buffer)
+            if not size:
+                break
+            destination.write(buffer[:size])
+
+
+def _raw_open(file: IO[bytes] | str | pathlib.Path, mode: str = 'rb') -> IO[bytes]:
+    """Open an uncompressed file, a file object is returned as is."""
+    if isinstance(file, (str, pathlib.Path)):
+        return open(file, mode, buffering=BUFFER_SIZE)
+    return file
+
+
+_KERNEL_COPY_SIZE = 1 << 24
+"""Maximal number of bytes copied by a single kernel copy call."""
+_KERNEL_COPY_UNSUPPORTED_ERRNOS = frozenset({
+        errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP,
+        errno.EBADF, errno.ENOTSOCK})
+"""Errors meaning that the kernel copy is not possible between the files."""
+
+
+def _kernel_copy(
+        copy_function: Callable[[int, int], int],
+        source_fd: int, destination_fd: int) -> bool:
+    """Copy the rest of the file using the kernel copy function.
+
+    Returns:
+        False if the copy function is not supported for the files
+        (nothing was copied), otherwise True
+    """
+    copied_any = False
+    while True:
+        try:
+            size = copy_function(source_fd, destination_fd)
+        except OSError as os_err:
+            if (
+                    not copied_any
+                    and os_err.errno in _KERNEL_COPY_UNSUPPORTED_ERRNOS):
+                return False
+            raise
+        if not size:
+            return True
+        copied_any = True
+
+
+def _copy_file_data(source: IO[bytes], destination: IO[bytes]) -> None:
+    """Copy binary file data without passing it through Python if possible.
+
+    The data are copied by `os.copy_file_range()` (regular files)
+    or `os.sendfile()` (Linux, also to a pipe) inside the kernel.
+    `_copy_file_object()` is the fallback. The source must not be read
+    before and the destination must not be written before because of
+    their buffers.
+    """
+    copy_functions: list[Callable[[int, int], int]] = []
+    if hasattr(os, 'copy_file_range'):
+        copy_functions.append(
+                lambda source_fd, destination_fd: os.copy_file_range(
+                    source_fd, destination_fd, _KERNEL_COPY_SIZE))
+    if sys.platform.startswith('linux') and hasattr(os, 'sendfile'):
+        copy_functions.append(
+                lambda source_fd, destination_fd: os.sendfile(
+                    destination_fd, source_fd, None, _KERNEL_COPY_SIZE))
+    try:
+        source_fd = source.fileno()
+        destination_fd = destination.fileno()
+    except (AttributeError, OSError):
+        copy_functions = []
+    for copy_function in copy_functions:
+        if _kernel_copy(copy_function, source_fd, destination_fd):
+            return
+    _copy_file_object(source, destination)
+
+
+_PROC_FD_DIR = '/proc/self/fd'
+"""Directory with links to the open files used to name anonymous files."""
+
+
+def _open_anon_tempfile(dir_: str | None = None) -> int | None:
+    """Open an anonymous temporary file (Linux `O_TMPFILE`).
+
+    The file has no name so it cannot be left behind. Give it a name
+    using `_link_anon_tempfile()`.
+
+    Returns:
+        file descriptor or None if anonymous files are not supported
+        (including naming them) in the directory
+    """
+    dir_ = os.path.abspath(dir_ or tempfile.gettempdir())
+    if not _anon_tempfile_supported(dir_):
+        return None
+    return os.open(dir_, os.O_TMPFILE | os.O_RDWR | os.O_CLOEXEC, 0o600)
+
+
+def _link_anon_tempfile(
+        fd: int, dir_: str | None = None,
+        prefix: str | None = None, suffix: str | None = None) -> str:
+    """Create a unique name in the style of `mkstemp()` for anonymous file.
+
+    Returns:
+        absolute path of the file
+    """
+    dir_ = os.path.abspath(dir_ or tempfile.gettempdir())
+    prefix = tempfile.gettempprefix() if prefix is None else prefix
+    suffix = suffix or ''
+    # os.link() calls linkat() with AT_SYMLINK_FOLLOW only with a dir_fd.
+    proc_fd_dir_fd = os.open(_PROC_FD_DIR, os.O_RDONLY)
+    try:
+        for _ in range(tempfile.TMP_MAX):
+            path = os.path.join(
+                    dir_, f'{prefix}{secrets.token_hex(4)}{suffix}')
+            try:
+                os.link(
+                        str(fd), path, src_dir_fd=proc_fd_dir_fd,
+                        follow_symlinks=True)
+            except FileExistsError:
+                continue
+            return path
+    finally:
+        os.close(proc_fd_dir_fd)
+    raise FileExistsError(
+            errno.EEXIST, 'No usable temporary file name found', dir_)
+
+
+@functools.lru_cache(maxsize=None)
+def _anon_tempfile_supported(dir_: str) -> bool:
+    """Check if an anonymous file can be created and named in the directory.
+
+    The check is done before the decompression because naming the file
+    (`linkat()` through `/proc/self/fd`) can fail only after the data are
+    written, e.g. without procfs or on some network file systems.
+    """
+    if not hasattr(os, 'O_TMPFILE') or not os.path.isdir(_PROC_FD_DIR):
+        return False
+    try:
+        fd = os.open(dir_, os.O_TMPFILE | os.O_RDWR | os.O_CLOEXEC, 0o600)
+    except OSError:
+        return False
+    try:
+        path = _link_anon_tempfile(fd, dir_)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    with contextlib.suppress(OSError):
+        os.remove(path)
+    return True
+
+
+_TEMPFILE_POOL_SIZE_ENV = 'VB_UTILS_TEMPFILE_POOL_SIZE'
+"""Environment variable setting the default of `TEMPFILE_POOL_SIZE`."""
+_TEMPFILE_POOL_SIZE_DEFAULT = 4
+
+
+def _tempfile_pool_size_from_env() -> int:
+    """Get the temporary files pool size from the environment variable.
+
+    An invalid value is ignored with a warning.
+    """
+    value = os.environ.get(_TEMPFILE_POOL_SIZE_ENV)
+    if value is None:
+        return _TEMPFILE_POOL_SIZE_DEFAULT
+    try:
+        return int(value)
+    except ValueError:
+        warnings.warn(
+                f'Invalid value of {_TEMPFILE_POOL_SIZE_ENV}: {value!r}, '
+                f'using {_TEMPFILE_POOL_SIZE_DEFAULT}')
+        return _TEMPFILE_POOL_SIZE_DEFAULT
+
+
+TEMPFILE_POOL_SIZE = _tempfile_pool_size_from_env()
+"""Maximal number of reusable temporary files kept for `reuse_tempfile`.
+
+The default can be set by the environment variable
+`VB_UTILS_TEMPFILE_POOL_SIZE`.
+"""
+
+
+class _TempFilePool:
+    """Pool of empty temporary files kept for reuse.
+
+    The files are grouped by their directory, prefix and suffix. Remaining
+    files are removed at the interpreter exit.
+    """
+
+    def __init__(self) -> None:
+        self._paths: dict[tuple[str | None, ...], list[str]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: tuple[str | None, ...]) -> str | None:
+        """Take a file path out of the pool, None if there is none."""
+        with self._lock:
+            paths = self._paths.get(key)
+            return paths.pop() if paths else None
+
+    def give(self, key: tuple[str | None, ...], path: str) -> bool:
+        """Truncate the file and put it to the pool if it is not full.
+
+        Returns:
+            True if the file was put to the pool
+        """
+        with self._lock:
+            if sum(map(len, self._paths.values())) >= TEMPFILE_POOL_SIZE:
+                return False
+            try:
+                os.truncate(path, 0)
+            except OSError:
+                return False
+            self._paths.setdefault(key, []).append(path)
+            return True
+
+    def clear(self) -> None:
+        """Remove all the pooled files."""
+        with self._lock:
+            for paths in self._paths.values():
+                for path in paths:
+                    with contextlib.suppress(OSError):
+                        os.remove(path)
+            self._paths.clear()
+
+
+_tempfile_pool = _TempFilePool()
+atexit.register(_tempfile_pool.clear)
+
+
+_GZIP_MAGIC = b'\x1f\x8b'
+"""The first bytes of a gzip file."""
+_DEFLATE_MAX_RATIO = 1032
+"""Maximal compression ratio of the deflate algorithm."""
+
+
+def _gzip_size_hint(path: str | pathlib.Path) -> int:
+    """Get the decompressed size of a gzip file from its trailer (ISIZE).
+
+    The size is stored modulo 2**32 and for multi-member files it is
+    the size of the last member only so use it just as a hint.
+
+    Returns:
+        the decompressed size or 0 if it is unknown
+    """
+    try:
+        with open(path, 'rb') as gzip_file:
+            if gzip_file.read(2) != _GZIP_MAGIC:
+                return 0
+            compressed_size = gzip_file.seek(-4, os.SEEK_END) + 4
+            size = struct.unpack('<I', gzip_file.read(4))[0]
+    except (OSError, struct.error):
+        return 0
+    # Do not allocate nonsense sizes of corrupted files.
+    return size if size <= compressed_size * _DEFLATE_MAX_RATIO else 0
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Allocate the file space in advance to avoid its fragmentation."""
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return
+    with contextlib.suppress(OSError):      # e.g. unsupported file system
+        os.posix_fallocate(fd, 0, size)
 
 
 # pylint: disable=too-many-instance-attributes  # We support similar arguments as tempfile.mkstemp.
 class TemporaryDecompressedFile(contextlib.AbstractContextManager):
-    """A context manager for creating a temporarily decompressed file.
+    r"""A context manager for creating a temporarily decompressed file.
 
     In `__enter__()` the given file is decompressed to a temporary file
     whose path is returned. The temporary file is deleted in `__exit__()`.
 
+    With the `fifo` backend a named pipe is created instead of the temporary
+    file and the decompressed data are written to it by a background thread
+    while the caller reads it. Nothing is written to the disk but the path
+    can be read only once, sequentially. The `fifo` backend falls back to
+    `file` on platforms without `os.mkfifo()` (Windows).
+
     Note:
         Currently the spinner shows only its first phase to indicate
         that the decompression is in progress.
@@ -43,6 +473,144 @@ class TemporaryDecompressedFile(contextlib.AbstractContextManager):
         * Check if support for text mode works and if we should keep it.
         * Check if decompression progress callback can be implemented
             reasonably.
+
+    Examples:
+        >>> import bz2, gzip, lzma, tempfile, zipfile
+        >>> work_dir_obj = tempfile.TemporaryDirectory()
+        >>> work_dir = work_dir_obj.name
+        >>> data = b'line 1\nline 2\n'
+        >>> gz_path = os.path.join(work_dir, 'data.txt.gz')
+        >>> with gzip.open(gz_path, 'wb') as gz_file:
+        ...     _ = gz_file.write(data)
+
+        Every gzip backend decompresses to a temporary file which is
+        removed at the exit:
+
+        >>> for gzip_backend in GZIP_BACKENDS:
+        ...     with TemporaryDecompressedFile(
+        ...             gz_path, gzip_backend=gzip_backend, dir_=work_dir
+        ...             ) as path:
+        ...         with open(path, 'rb') as decompressed_file:
+        ...             assert decompressed_file.read() == data, gzip_backend
+        ...     assert not os.path.exists(path), gzip_backend
+        >>> os.listdir(work_dir)
+        ['data.txt.gz']
+
+        Other compression types:
+
+        >>> compressed_paths = []
+        >>> for name, open_compressed in [
+        ...         ('data.txt.bz2', bz2.open), ('data.txt.xz', lzma.open)]:
+        ...     compressed_paths.append(os.path.join(work_dir, name))
+        ...     with open_compressed(compressed_paths[-1], 'wb') as file:
+        ...         _ = file.write(data)
+        >>> compressed_paths.append(os.path.join(work_dir, 'data.zip'))
+        >>> with zipfile.ZipFile(compressed_paths[-1], 'w') as archive:
+        ...     archive.writestr('data.txt', data)
+        >>> for compressed_path in compressed_paths:
+        ...     with TemporaryDecompressedFile(compressed_path) as path:
+        ...         with open(path, 'rb') as decompressed_file:
+        ...             decompressed_file.read() == data
+        True
+        True
+        True
+
+        A file of unknown compression type is passed as is or copied:
+
+        >>> txt_path = os.path.join(work_dir, 'data.txt')
+        >>> with open(txt_path, 'wb') as txt_file:
+        ...     _ = txt_file.write(data)
+        >>> with TemporaryDecompressedFile(txt_path) as path:
+        ...     path == txt_path
+        True
+        >>> with TemporaryDecompressedFile(
+        ...         txt_path, pass_unknown_compression_type=False) as path:
+        ...     with open(path, 'rb') as decompressed_file:
+        ...         path != txt_path, decompressed_file.read() == data
+        (True, True)
+
+        The `fifo` backend (a fifo which is not read is fine too):
+
+        >>> with TemporaryDecompressedFile(
+        ...         gz_path, backend='fifo', dir_=work_dir) as path:
+        ...     with open(path, 'rb') as decompressed_file:
+        ...         decompressed_file.read() == data
+        True
+        >>> with TemporaryDecompressedFile(
+        ...         gz_path, backend='fifo', dir_=work_dir) as path:
+        ...     pass
+        >>> sorted(os.listdir(work_dir))
+        ['data.txt', 'data.txt.bz2', 'data.txt.gz', 'data.txt.xz', 'data.zip']
+
+        The `stream` mode:
+
+        >>> with TemporaryDecompressedFile(gz_path, stream=True) as file:
+        ...     file.readline()
+        b'line 1\n'
+
+        Reused temporary file:
+
+        >>> paths = []
+        >>> for _ in range(2):
+        ...     with TemporaryDecompressedFile(
+        ...             gz_path, dir_=work_dir, reuse_tempfile=True) as path:
+        ...         with open(path, 'rb') as decompressed_file:
+        ...             assert decompressed_file.read() == data
+        ...     paths.append(path)
+        >>> paths[0] == paths[1], os.path.getsize(paths[0])
+        (True, 0)
+        >>> _tempfile_pool.clear()
+        >>> os.path.exists(paths[0])
+        False
+
+        Temporary file in the default temporary directory:
+
+        >>> with TemporaryDecompressedFile(gz_path, prefer_tmpfs=False) as path:
+        ...     os.path.dirname(path) == tempfile.gettempdir()
+        True
+
+        Errors leave no temporary files behind:
+
+        >>> bad_path = os.path.join(work_dir, 'bad.gz')
+        >>> with open(bad_path, 'wb') as bad_file:
+        ...     _ = bad_file.write(b'not gzip data')
+        >>> with TemporaryDecompressedFile(
+        ...         bad_path, gzip_backend='gzip', dir_=work_dir) as path:
+        ...     pass
+        Traceback (most recent call last):
+        ...
+        gzip.BadGzipFile: Not a gzipped file (b'no')
+        >>> for gzip_backend in GZIP_BACKENDS:
+        ...     for backend in 'file', 'fifo':
+        ...         try:
+        ...             with TemporaryDecompressedFile(
+        ...                     bad_path, gzip_backend=gzip_backend,
+        ...                     backend=backend, dir_=work_dir) as path:
+        ...                 with open(path, 'rb') as decompressed_file:
+        ...                     _ = decompressed_file.read()
+        ...         except (OSError, ValueError):
+        ...             pass
+        ...         else:
+        ...             print('No error:', gzip_backend, backend)
+        >>> with TemporaryDecompressedFile(
+        ...         os.path.join(work_dir, 'missing.gz'), dir_=work_dir) as path:
+        ...     pass        # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        ...
+        FileNotFoundError: [Errno 2] No such file or directory: '...missing.gz'
+        >>> with TemporaryDecompressedFile(
+        ...         os.path.join(work_dir, 'missing.gz'), backend='fifo',
+        ...         dir_=work_dir) as path:
+        ...     with open(path, 'rb') as decompressed_file:
+        ...         decompressed_file.read()        # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        ...
+        FileNotFoundError: [Errno 2] No such file or directory: '...missing.gz'
+        >>> sorted(os.listdir(work_dir))[:2]
+        ['bad.gz', 'data.txt']
+        >>> len(os.listdir(work_dir))
+        6
+        >>> work_dir_obj.cleanup()
     """
     compressed_path: str | pathlib.Path
     """The path to the compressed file."""
@@ -53,12 +621,34 @@ class TemporaryDecompressedFile(contextlib.AbstractContextManager):
     dir: str | None
     """The directory of the temporary decompressed file."""
     pass_unknown_compression_type: bool
-    """If `True`, the of unknown compression is passed directly."""
+    """If `True`, the of unknown compression is passed directly.
+
+    If `False`, the file is copied to the temporary file as is.
+    """
     compression_type: str | None
     """The type of compression."""
     spinner: ppr.Spinner | None
     """The spinner instance to show that decompression is in progress."""
+    gzip_backend: str | None
+    """The key of the module in `GZIP_BACKENDS` used for gzip.
+
+    `None` means to choose the fastest available one for the file size.
+    """
+    backend: str
+    """Where to decompress: `file` or `fifo`."""
     decompressed_path: str | None
+    fifo_dir: str | None
+    """The temporary directory containing the fifo."""
+    fifo_writer: threading.Thread | None
+    """The thread writing the decompressed data to the fifo."""
+    fifo_writer_error: Exception | None
+    """The exception raised in the fifo writer thread."""
+    stream: bool
+    """If `True`, the decompressed file object is returned, not a path."""
+    decompressed_file: IO[bytes] | None
+    """The decompressed file object returned in the `stream` mode."""
+    reuse_tempfile: bool
+    """If `True`, the temporary file is reused from/returned to a pool."""
 
     # pylint: disable=too-many-arguments    # We support similar arguments as tempfile.mkstemp().
     def __init__(
@@ -67,7 +657,10 @@ class TemporaryDecompressedFile(contextlib.AbstractContextManager):
             pass_unknown_compression_type: bool = True,
             spinner: ppr.Spinner | None = None,
             suffix: str | None = None,
-            prefix: str | None = None, dir_=None):
+            prefix: str | None = None, dir_=None,
+            gzip_backend: str | None = None, backend: str = 'file',
+            stream: bool = False, prefer_tmpfs: bool = True,
+            reuse_tempfile: bool = False):
         """Initialize the decompressed context manager.
 
         Args:
@@ -76,62 +669,332 @@ class TemporaryDecompressedFile(contextlib.AbstractContextManager):
                 is determined from the file name suffix.
             pass_unknown_compression_type: If `True`, the of unknown
                 compression is passed directly (its path is returned as is).
+                If `False`, the file is copied as is like when it is
+                decompressed.
             spinner: The spinner instance to show that decompression is
                 in progress.
             suffix: The suffix of the temporary decompressed file.
             prefix: The prefix of the temporary decompressed file.
             dir_: The directory of the temporary decompressed file.
+            gzip_backend: The key of the module in `GZIP_BACKENDS`
+                to use for gzip decompression. By default the fastest
+                available one is used: `rapidgzip` for files of at least
+                `RAPIDGZIP_MIN_SIZE` bytes on multi-core machines,
+                otherwise `isal`.
+            backend: `file` to decompress to a temporary file, `fifo`
+                to decompress on the fly to a named pipe. The spinner is
+                not used with `fifo`.
+            stream: If `True`, return a file object reading the decompressed
+                data instead of a path. The spinner and backend are
+                not used.
+            prefer_tmpfs: If `True` and `dir_` is not given, create
+                the temporary file on tmpfs (`/dev/shm`) when the default
+                temporary directory is not on tmpfs. This avoids writing
+                the decompressed data to the disk but the file occupies
+                RAM. Set to `False` for files larger than the available
+                memory.
+            reuse_tempfile: If `True`, the temporary file is not removed
+                in `__exit__()` but truncated and kept for reuse by
+                the next instance (up to `TEMPFILE_POOL_SIZE` files).
+                This saves the file creation and removal when many files
+                are decompressed one by one. The returned path is then
+                not unique during the process lifetime.
         """
         self.compressed_path = compressed_path
         self.suffix = suffix
         self.prefix = prefix
+        if dir_ is None and prefer_tmpfs:
+            dir_ = _default_tmpfs_dir()
         self.dir = dir_
         self.pass_unknown_compression_type = pass_unknown_compression_type
         self.compression_type = None
         self.spinner = spinner
+        if gzip_backend is not None and gzip_backend not in GZIP_BACKENDS:
+            raise ValueError(f'Unavailable gzip backend: {gzip_backend}')
+        self.gzip_backend = gzip_backend
+        if backend not in {'file', 'fifo'}:
+            raise ValueError(f'Unknown backend: {backend}')
+        if backend == 'fifo' and not hasattr(os, 'mkfifo'):
+            backend = 'file'
+        self.backend = backend
         self.decompressed_path = None
+        self.fifo_dir = None
+        self.fifo_writer = None
+        self.fifo_writer_error = None
+        self.stream = stream
+        self.decompressed_file = None
+        self.reuse_tempfile = reuse_tempfile
         if compression_type_from_suffix:
-            self.compression_type = COMPRESSION_SUFFIXES.get(pathlib.Path(compressed_path).suffix)
+            suffix_lower = os.path.splitext(
+                    os.fspath(compressed_path))[1].lower()
+            self.compression_type = _COMPRESSION_SUFFIXES_LOWER.get(suffix_lower)
+
+    def _default_gzip_backend(self) -> str:
+        """Choose the fastest available gzip backend for the file."""
+        if (
+                'rapidgzip' in GZIP_BACKENDS
+                and (os.cpu_count() or 1) > 1
+                and os.path.getsize(self.compressed_path)
+                >= RAPIDGZIP_MIN_SIZE):
+            return 'rapidgzip'
+        return 'isal' if 'isal' in GZIP_BACKENDS else 'gzip'
+
+    def _get_opener(self) -> Callable[..., IO[bytes]]:
+        """Get the function opening the compressed file for decompression."""
+        compression_type = self.compression_type
+        if compression_type is None:    # copy the file as is
+            return _raw_open
+        if compression_type == 'gzip':
+            gzip_backend = self.gzip_backend or self._default_gzip_backend()
+            return _GZIP_BACKEND_OPENERS.get(
+                    gzip_backend, GZIP_BACKENDS[gzip_backend].open)
+        opener = _OPENERS.get(compression_type)
+        if opener is None:
+            raise ValueError(
+                    f'Unsupported compression type: {compression_type}')
+        return opener
+
+    def _decompress_to(
+            self, opener: Callable[..., IO[bytes]],
+            decompressed_file: IO[bytes]) -> None:
+        """Decompress the compressed file to the binary file object."""
+        with open(
+                self.compressed_path, 'rb', buffering=BUFFER_SIZE
+                ) as compressed_file:
+            if opener is _raw_open:
+                _copy_file_data(compressed_file, decompressed_file)
+                return
+            with opener(compressed_file, 'rb') as onfly_decompressed_file:
+                _copy_file_object(onfly_decompressed_file, decompressed_file)
+
+    def _write_fifo(self, opener: Callable[..., IO[bytes]]) -> None:
+        """Decompress the file to the fifo. Run in the fifo writer thread."""
+        assert self.decompressed_path is not None
+        try:
+            # The fifo is opened first so the reader is not blocked forever
+            # if opening of the compressed file fails.
+            with open(self.decompressed_path, 'wb') as fifo:
+                self._decompress_to(opener, fifo)
+        except BrokenPipeError:         # the reader stopped reading
+            pass
+        except Exception as exc:        # pylint: disable=broad-except
+            self.fifo_writer_error = exc
+
+    def _enter_fifo(self, opener: Callable[..., IO[bytes]]) -> str:
+        """Create the fifo and start the thread writing to it."""
+        self.fifo_dir = tempfile.mkdtemp(
+                suffix=self.suffix, prefix=self.prefix, dir=self.dir)
+        self.decompressed_path = os.path.join(
+                self.fifo_dir, 'decompressed' + (self.suffix or ''))
+        os.mkfifo(self.decompressed_path, 0o600)
+        self.fifo_writer = threading.Thread(
+                target=self._write_fifo, args=(opener,), daemon=True)
+        self.fifo_writer.start()
+        return self.decompressed_path
+
+    def _stop_fifo_writer(self) -> None:
+        """Stop the fifo writer thread and wait for it to finish."""
+        assert self.fifo_writer is not None and self.decompressed_path
+        # If the reader did not open the fifo or did not read all the data,
+        # the writer is blocked. Opening and closing the fifo for reading
+        # makes the writer fail with BrokenPipeError. Repeat it in case
+        # the writer did not get to opening the fifo yet.
+        while self.fifo_writer.is_alive():
+            try:
+                os.close(os.open(
+                        self.decompressed_path, os.O_RDONLY | os.O_NONBLOCK))
+            except OSError:
+                pass
+            self.fifo_writer.join(0.01)
+        self.fifo_writer = None
 
     def __enter__(self):
         """Enter the context manager."""
         if (
                 self.compression_type is None
                 and self.pass_unknown_compression_type):
+            if self.stream:
+                self.decompressed_file = open(
+                        self.compressed_path, 'rb', buffering=BUFFER_SIZE)
+                return self.decompressed_file
             return self.compressed_path
-        decompressed_fd, self.decompressed_path = tempfile.mkstemp(
-                suffix=self.suffix, prefix=self.prefix, dir=self.dir, text=False)
-        with contextlib.ExitStack() as stack:
-            decompressed_file = stack.enter_context(
-                    os.fdopen(decompressed_fd, 'wb'))
+        opener = self._get_opener()
+        if self.stream:
+            # Large buffer makes small reads (e.g. lines) cheaper.
+            self.decompressed_file = io.BufferedReader(
+                    opener(self.compressed_path, 'rb'), BUFFER_SIZE)
+            return self.decompressed_file
+        if self.backend == 'fifo':
+            return self._enter_fifo(opener)
+        decompressed_fd = self._open_pooled_tempfile()
+        if decompressed_fd is None:
+            # The anonymous file gets its name only after a successful
+            # decompression, so no partial file remains after a failure.
+            decompressed_fd = _open_anon_tempfile(self.dir)
+        if decompressed_fd is None:
+            decompressed_fd, self.decompressed_path = tempfile.mkstemp(
+                    suffix=self.suffix, prefix=self.prefix, dir=self.dir,
+                    text=False)
+        try:
             if self.compression_type == 'gzip':
-                onfly_decompressed_file = stack.enter_context(
-                        gzip.open(self.compressed_path, 'rb'))
-            else:
-                raise ValueError(
-                        f'Unsupported compression type: '
-                        f'{self.compression_type}')
-            if self.spinner is not None:
-                stack.enter_context(self.spinner)
-            shutil.copyfileobj(onfly_decompressed_file, decompressed_file)
+                _preallocate(
+                        decompressed_fd, _gzip_size_hint(self.compressed_path))
             # The copied files must be opened in binary mode.
-        try:
+            with os.fdopen(
+                    decompressed_fd, 'wb', closefd=False) as decompressed_file:
+                with self.spinner or contextlib.nullcontext():
+                    self._decompress_to(opener, decompressed_file)
+                # Cut off the preallocated space if the size hint was wrong.
+                decompressed_file.truncate()
+            if self.decompressed_path is None:
+                self.decompressed_path = _link_anon_tempfile(
+                        decompressed_fd, self.dir, self.prefix, self.suffix)
+        except BaseException:
+            self._release_tempfile()
+            raise
+        finally:
             os.close(decompressed_fd)
-        except OSError as os_err:       # file descriptor is normally closed
-            if os_err.args[0] != errno.EBADF:   # so do not raise if closed
-                raise
         return self.decompressed_path
 
+    def _pool_key(self) -> tuple[str | None, ...]:
+        """Get the key of the temporary files pool for this instance."""
+        return self.dir, self.prefix, self.suffix
+
+    def _open_pooled_tempfile(self) -> int | None:
+        """Open a temporary file from the pool if reuse is enabled.
+
+        Returns:
+            file descriptor or None if there is no file to reuse
+        """
+        if not self.reuse_tempfile:
+            return None
+        while (path := _tempfile_pool.take(self._pool_key())) is not None:
+            try:
+                decompressed_fd = os.open(path, os.O_WRONLY)
+            except OSError:             # the file was removed meanwhile
+                continue
+            self.decompressed_path = path
+            return decompressed_fd
+        return None
+
+    def _release_tempfile(self) -> None:
+        """Return the temporary file to the pool or remove it."""
+        if self.decompressed_path is None:
+            return
+        if not (
+                self.reuse_tempfile
+                and self.fifo_dir is None       # a fifo cannot be reused
+                and _tempfile_pool.give(
+                    self._pool_key(), self.decompressed_path)):
+            try:
+                os.remove(self.decompressed_path)
+            except OSError as os_err:
+                warnings.warn(
+                    f'Failed to remove temporary file '
+                    f'{self.decompressed_path!r}: {os_err}')
+        self.decompressed_path = None
+
     def __exit__(
                 self, __exc_type: Type[BaseException] | None,
                 __exc_value: BaseException | None,
                 __traceback: TracebackType | None) -> None:
         """Exit the context manager."""
         del __exc_type, __exc_value, __traceback
-        if self.decompressed_path is not None:
+        if self.decompressed_file is not None:
+            self.decompressed_file.close()
+            self.decompressed_file = None
+        if self.fifo_writer is not None:
+            self._stop_fifo_writer()
+        self._release_tempfile()
+        if self.fifo_dir is not None:
             try:
-                os.remove(self.decompressed_path)
+                os.rmdir(self.fifo_dir)
             except OSError as os_err:
                 warnings.warn(
-                    f'Failed to remove temporary file '
-                    f'{self.decompressed_path!r}: {os_err}')
+                    f'Failed to remove temporary directory '
+                    f'{self.fifo_dir!r}: {os_err}')
+        if self.fifo_writer_error is not None:
+            raise self.fifo_writer_error
+
+
+def _decompress_one(path: str | pathlib.Path, **kwargs: Any) -> str:
+    """Decompress a file to a temporary file which is not removed."""
+    return os.fspath(TemporaryDecompressedFile(path, **kwargs).__enter__())
+
+
+def decompress_many(
+        paths: Iterable[str | pathlib.Path], workers: int | None = None,
+        **kwargs: Any) -> list[str]:
+    """Decompress multiple files in parallel to temporary files.
+
+    The decompression libraries release the GIL so the files are
+    decompressed by a pool of threads. The caller is responsible
+    for removing the temporary files. Paths of files of unknown compression
+    type are returned unchanged (by default).
+
+    Args:
+        paths: The paths to the compressed files.
+        workers: The number of threads. By default the number of CPUs.
+        kwargs: Other arguments for `TemporaryDecompressedFile`
+            (the `backend` is always `file`, `stream` is not supported).
+
+    Returns:
+        The paths of the decompressed files in the order of `paths`.
+
+    Raises:
+        ValueError: if `stream` is requested
+
+    Examples:
+        >>> import gzip, tempfile
+        >>> work_dir_obj = tempfile.TemporaryDirectory()
+        >>> work_dir = work_dir_obj.name
+        >>> gz_paths = [os.path.join(work_dir, f'{i}.gz') for i in range(3)]
+        >>> for i, gz_path in enumerate(gz_paths):
+        ...     with gzip.open(gz_path, 'wb') as gz_file:
+        ...         _ = gz_file.write(b'%d' % i)
+        >>> paths = decompress_many(gz_paths, dir_=work_dir)
+        >>> for path in paths:
+        ...     with open(path, 'rb') as decompressed_file:
+        ...         print(decompressed_file.read(), end=',')
+        ...     os.remove(path)
+        b'0',b'1',b'2',
+
+        A failure removes the other decompressed files:
+
+        >>> decompress_many(
+        ...     gz_paths + [os.path.join(work_dir, 'missing.gz')],
+        ...     dir_=work_dir)      # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        ...
+        FileNotFoundError: [Errno 2] No such file or directory: '...missing.gz'
+        >>> sorted(os.listdir(work_dir))
+        ['0.gz', '1.gz', '2.gz']
+
+        >>> decompress_many(gz_paths, stream=True)
+        Traceback (most recent call last):
+        ...
+        ValueError: The stream mode is not supported.
+        >>> work_dir_obj.cleanup()
+    """
+    # Imported here because it loads also the logging module.
+    import concurrent.futures
+
+    if kwargs.get('stream'):
+        raise ValueError('The stream mode is not supported.')
+    paths = list(paths)
+    kwargs['backend'] = 'file'
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count()) as executor:
+        futures = [
+                executor.submit(_decompress_one, path, **kwargs)
+                for path in paths]
+    exceptions = [future.exception() for future in futures]
+    errors = [error for error in exceptions if error is not None]
+    if errors:
+        # Do not leave the successfully created temporary files behind.
+        for path, future, exception in zip(paths, futures, exceptions):
+            if exception is None and future.result() != os.fspath(path):
+                with contextlib.suppress(OSError):
+                    os.remove(future.result())
+        raise errors[0]
+    return [future.result() for future in futures]
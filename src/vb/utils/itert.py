@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import collections
 import itertools
 import re
-from typing import Final, Hashable, Iterable, Iterator, TypeVar, cast
+import sys
+from typing import (
+        TYPE_CHECKING, Final, Hashable, Iterable, Iterator, TypeVar)
+
+if TYPE_CHECKING:
+    import numpy
 
 _T1 = TypeVar('_T1')
 _T2 = TypeVar('_T2')
@@ -35,10 +41,10 @@ def first_last(
         (None, None)
     """
     iterator = iter(iter_arg)
-    first = last = next(iterator, default_value)
-    for last in iterator:
-        pass
-    return first, last
+    first = next(iterator, default_value)
+    # Consume the rest of the iterator in C, keep only the last item.
+    tail = collections.deque(iterator, maxlen=1)
+    return first, tail[0] if tail else first
 
 
 def list_to_ranges(input_list: Iterable[int]) -> Iterator[tuple[int, int]]:
@@ -54,6 +60,8 @@ def list_to_ranges(input_list: Iterable[int]) -> Iterator[tuple[int, int]]:
     should contain only unique and sorted numbers to create
     the optimal (minimal possible) list of ranges.
 
+    NumPy arrays are processed by the vectorized `list_to_ranges_np()`.
+
     Args:
         input_list: iterable of integers (usually unique and sorted)
 
@@ -70,15 +78,54 @@ def list_to_ranges(input_list: Iterable[int]) -> Iterator[tuple[int, int]]:
         >>> list(list_to_ranges([]))
         []
     """
-    # Group items by differences between the values and their indices.
-    # Consecutive values are grouped together as they have the same difference.
-    for _, indexed_group in itertools.groupby(
-            enumerate(input_list),
-            lambda index_value: index_value[0] - index_value[1]):
-        first_value, last_value = first_last(indexed_group)
-        if first_value is not None and last_value is not None:
-            # Yield the range which is the first and last value of the group.
-            yield first_value[1], last_value[1]
+    numpy_module = sys.modules.get('numpy')
+    if (
+            numpy_module is not None
+            and isinstance(input_list, numpy_module.ndarray)):
+        for first, last in list_to_ranges_np(input_list).tolist():
+            yield first, last
+        return
+    iterator = iter(input_list)
+    try:
+        start = previous = next(iterator)
+    except StopIteration:
+        return
+    for value in iterator:
+        if value != previous + 1:
+            yield start, previous
+            start = value
+        previous = value
+    yield start, previous
+
+
+def list_to_ranges_np(input_array: numpy.ndarray) -> numpy.ndarray:
+    """Return array of ranges from 1-D NumPy array of integers.
+
+    This is a vectorized variant of `list_to_ranges()` for large arrays.
+    Requires the numpy package.
+
+    Args:
+        input_array: 1-D array of integers (usually unique and sorted)
+
+    Returns:
+        array of shape (n, 2) of the first and last values of the ranges
+
+    Examples:
+        >>> import numpy as np
+        >>> list_to_ranges_np(np.array([0, 1, 2, 3, 4, 7, 8, 9, 11])).tolist()
+        [[0, 4], [7, 9], [11, 11]]
+
+        >>> list_to_ranges_np(np.array([], dtype=int)).shape
+        (0, 2)
+    """
+    import numpy as np                  # optional dependency
+
+    if not len(input_array):
+        return np.empty((0, 2), dtype=input_array.dtype)
+    breaks = np.flatnonzero(np.diff(input_array) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(input_array) - 1]))
+    return np.stack((input_array[starts], input_array[ends]), axis=1)
 
 
 def group_items_by_keys(
@@ -103,12 +150,11 @@ def group_items_by_keys(
         >>> group_items_by_keys([1, 2, 3], ['x', 'x', 'y'])
         {'x': [1, 2], 'y': [3]}
     """
-    result: dict[_T2, list[_T1]] = {}
+    result: collections.defaultdict[_T2, list[_T1]] = (
+            collections.defaultdict(list))
     for key, item in zip(keys, items):
-        if key not in result:
-            result[key] = []
         result[key].append(item)
-    return result
+    return dict(result)
 
 
 def iter_len(iterator: Iterable) -> int:
@@ -123,7 +169,11 @@ def iter_len(iterator: Iterable) -> int:
         >>> iter_len(range(10))
         10
     """
-    return sum(1 for _ in iterator)
+    # Count in C without materializing the items: zip() stops pulling
+    # from the counter when the iterator is exhausted.
+    counter = itertools.count()
+    collections.deque(zip(iterator, counter), maxlen=0)
+    return next(counter)
 
 
 def are_items_unique(items: Iterable[Hashable]) -> bool:
@@ -137,19 +187,24 @@ def are_items_unique(items: Iterable[Hashable]) -> bool:
         False
     """
     seen = set()
-    # The generator expression uses side-effect on the set seen.
-    return not any(
-            item in seen or cast(None, seen.add(item))
-            for item in items)
+    for item in items:
+        if item in seen:
+            return False
+        seen.add(item)
+    return True
 
 
 IDENTIFIERS_INVALID_CHARS_RE: Final[str] = r'[^a-zA-Z0-9]'
+_ASCII_NON_ALNUM: Final[str] = ''.join(
+        char for char in map(chr, range(128))
+        if re.fullmatch(IDENTIFIERS_INVALID_CHARS_RE, char))
+"""ASCII characters matched by `IDENTIFIERS_INVALID_CHARS_RE`."""
 
 
 def unique_identifiers(
         names: Iterable[str], invalid_chars: str = IDENTIFIERS_INVALID_CHARS_RE,
         replacement_char: str = '_') -> list[str]:
-    """Create list of valid unique identifiers from a list of names.
+    r"""Create list of valid unique identifiers from a list of names.
 
     Invalid characters are replaced. Repeated identifiers are given a numeric
     suffix. The returned list contains the identifiers at the same indexes as
@@ -169,24 +224,47 @@ def unique_identifiers(
         >>> unique_identifiers(('name@domain', 'name.domain', 'name_domain'))
         ['name_domain_1', 'name_domain_2', 'name_domain_3']
 
+        >>> unique_identifiers(('křížek', 'a-b'), replacement_char='')
+        ['kek', 'ab']
+
+        >>> print(*unique_identifiers(('a-b', 'é-b'), replacement_char='\\'))
+        a\b \\b
+
         >>> unique_identifiers(('name@domain', 'name.domain', 'name_domain_1'))
         Traceback (most recent call last):
             ...
         ValueError: Function does not assure uniqueness with pre-existing numeric suffixes.
     """
-    identifiers = [re.sub(invalid_chars, replacement_char, name) for name in names]
+    pattern = re.compile(invalid_chars)
+
+    # A function as the replacement prevents interpretation of backslashes.
+    def replacement(_match: re.Match[str]) -> str:
+        return replacement_char
+
+    if invalid_chars == IDENTIFIERS_INVALID_CHARS_RE:
+        # str.translate() is faster than regex for the ASCII names.
+        table = str.maketrans(dict.fromkeys(_ASCII_NON_ALNUM, replacement_char))
+        identifiers = [
+                name.translate(table) if name.isascii()
+                else pattern.sub(replacement, name)
+                for name in names]
+    else:
+        identifiers = [pattern.sub(replacement, name) for name in names]
     identifier_counters = {
-            identifier: 1 if iter_len(group) > 1 else 0
-            for identifier, group in itertools.groupby(sorted(identifiers))}
+            identifier: 1 if count > 1 else 0
+            for identifier, count in collections.Counter(identifiers).items()}
     identifiers_unique = []
+    seen: set[str] = set()
     for identifier in identifiers:
         suffix = ''
         if identifier_counters[identifier]:
             suffix = f'_{identifier_counters[identifier]}'
             identifier_counters[identifier] += 1
-        identifiers_unique.append(identifier + suffix)
-    # Currently uniqueness is not assured in all cases. We have to check that.
-    if not are_items_unique(identifiers_unique):
-        raise ValueError(
-            'Function does not assure uniqueness with pre-existing numeric suffixes.')
+        identifier_unique = identifier + suffix
+        # Currently uniqueness is not assured in all cases. We have to check that.
+        if identifier_unique in seen:
+            raise ValueError(
+                'Function does not assure uniqueness with pre-existing numeric suffixes.')
+        seen.add(identifier_unique)
+        identifiers_unique.append(identifier_unique)
     return identifiers_unique
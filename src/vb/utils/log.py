@@ -24,11 +24,13 @@ class StreamHandler(logging.StreamHandler):
     """
 
     suppress_newline_code = '%[!n]'
+    _SUPPRESS_LEN = len(suppress_newline_code)
 
     def emit(self, record: logging.LogRecord) -> None:
         """Extend the method to be able to remove trailing newline."""
-        if record.msg.endswith(self.suppress_newline_code):
-            record.msg = record.msg[:-len(self.suppress_newline_code)]
+        msg = record.msg
+        if msg.endswith(self.suppress_newline_code):
+            record.msg = msg[:-self._SUPPRESS_LEN]
             self.terminator = ''
         else:
             self.terminator = '\n'
@@ -1,4 +1,9 @@
-"""Provide pretty text output."""
+"""Provide pretty text output.
+
+The terminal size returned by `get_terminal_size()` is stored. Applications
+can call `install_resize_handler()` to clear it when the terminal is resized.
+The module does not install any signal handler by itself.
+"""
 
 from __future__ import annotations
 
@@ -7,9 +12,13 @@ import os
 import pprint
 import math
 import sys
+import itertools
+import signal
+import time
 
-from typing import Optional, Sequence, TypeVar, Iterator, TextIO, Type
-from types import TracebackType
+from typing import (
+        Callable, Optional, Sequence, Tuple, TypeVar, Iterator, TextIO, Type)
+from types import FrameType, TracebackType
 
 
 _T1 = TypeVar('_T1')
@@ -57,7 +66,8 @@ class Spinner:
             self, sequence: str | Sequence[str] | None = None,
             suppress_nontty: bool = True,
             stream: TextIO = sys.stdout, reset_str: str = '\r',
-            cm_update_enter: bool = True) -> None:
+            cm_update_enter: bool = True,
+            min_interval: float = 0.1) -> None:
         """Initialize the spinner.
 
         Args:
@@ -70,6 +80,9 @@ class Spinner:
                 It resets the cursor to overwrite the spinner on next update.
             cm_update_enter: if True, update the spinner when entering
                 as the context manager
+            min_interval: minimal time in seconds between writes to the
+                stream, more frequent updates are ignored to avoid a write
+                and flush (system calls) for every update
 
         Todo:
             * spinners to add:
@@ -85,7 +98,10 @@ class Spinner:
         self.stream = stream
         self.reset_str = reset_str
         self.cm_update_enter = cm_update_enter
+        self.frames = [text + reset_str for text in sequence]
         self.iterator = self.get_iterator()
+        self.min_interval = min_interval
+        self.last_write_time = -math.inf
 
     def __enter__(self) -> Spinner:
         """Enter the context manager."""
@@ -101,31 +117,81 @@ class Spinner:
         self.cleanup()
 
     def get_iterator(self) -> Iterator[str]:
-        """Create an iterator to cycle through the sequence."""
-        while True:
-            for text in self.sequence:
-                yield text + self.reset_str
+        """Create an iterator to cycle through the precomputed frames."""
+        return itertools.cycle(self.frames)
 
     def update(self) -> None:
-        """Write the next spinner character to the stream."""
-        if not self.suppress:
-            self.stream.write(next(self.iterator))
+        """Write the next spinner character to the stream.
+
+        The update is skipped if the previous one was less than
+        `min_interval` seconds ago.
+        """
+        if self.suppress:
+            return
+        now = time.monotonic()
+        if now - self.last_write_time < self.min_interval:
+            return
+        self.last_write_time = now
+        self.stream.write(next(self.iterator))
+        self.stream.flush()
 
     def cleanup(self) -> None:
         """Cleanup the spinner."""
         if not self.suppress:
             self.stream.write(' ' * self.spinner_length + self.reset_str)
+            self.stream.flush()
+            self.last_write_time = -math.inf
 
 
 # --- functions (and module variables):
 
 _terminal_size: Optional[os.terminal_size] = None
+_previous_sigwinch_handler: object = None
+
+
+def _invalidate_terminal_size(signum: int, frame: Optional[FrameType]) -> None:
+    """Clear the stored terminal size (SIGWINCH signal handler).
+
+    The previously installed Python signal handler is called too.
+    """
+    global _terminal_size
+
+    _terminal_size = None
+    if callable(_previous_sigwinch_handler):
+        _previous_sigwinch_handler(signum, frame)
+
+
+def install_resize_handler() -> bool:
+    """Clear the stored terminal size when the terminal is resized.
+
+    Install a SIGWINCH signal handler. A signal handler installed before
+    from Python is kept being called by the new handler. Call this function
+    from the main thread of an application, after other libraries
+    (e.g. curses) installed their handlers.
+
+    Returns:
+        True if the handler is installed, False if it is not possible
+        (no SIGWINCH on the platform or not in the main thread)
+    """
+    global _previous_sigwinch_handler
+
+    try:
+        previous_handler = signal.getsignal(signal.SIGWINCH)
+        if previous_handler is _invalidate_terminal_size:
+            return True
+        _previous_sigwinch_handler = previous_handler
+        signal.signal(signal.SIGWINCH, _invalidate_terminal_size)
+    except (AttributeError, ValueError):    # no SIGWINCH or not main thread
+        return False
+    return True
 
 
 def get_terminal_size(force: bool = False) -> os.terminal_size:
     """Get output terminal size.
 
     Store the terminal size to the module's variable and return it.
+    The stored size is cleared when the terminal is resized only if
+    `install_resize_handler()` was called.
 
     Args:
         force: force retrieving the terminal size even when set already
@@ -166,15 +232,84 @@ def progress(
         * progress-bar
     """
     percent_str = '---'
-    if round(max_value) > 0:                # we have a max value
+    max_int = round(max_value)
+    if max_int > 0:                         # we have a max value
         max_value = max(max_value, 1)       # has to be a positive integer
         percent_str = f'{round(100 * value / max_value):>3d}'
-    max_str = f'{round(max_value):d}'
+    max_str = str(max_int)
     if num_digits is None:
         num_digits = len(max_str)           # the maximum value string length
     return f'{round(value):>{num_digits}d}/{max_str}  {percent_str} %'
 
 
+def make_progress(
+        max_value: float,
+        num_digits: Optional[int] = None) -> Callable[[float], str]:
+    """Make a function showing progress of value towards fixed max_value.
+
+    The returned function gives the same results as progress() but
+    the format is prepared just once. Use it in loops with many updates.
+
+    Args:
+        max_value: the maximum for the value, zero means undefined
+        num_digits: optional maximum number of digits override for the value
+
+    Returns:
+        function formatting the current value like progress()
+
+    Examples:
+        >>> progress_10 = make_progress(10)
+        >>> progress_10(1)
+        ' 1/10   10 %'
+
+        >>> make_progress(0)(5)
+        '5/0  --- %'
+    """
+    max_int = round(max_value)
+    max_str = str(max_int)
+    if num_digits is None:
+        num_digits = len(max_str)           # the maximum value string length
+    value_format = f'{{:>{num_digits}d}}/{max_str}  '.format
+    if max_int <= 0:                        # no max value
+        def progress_undefined(value: float) -> str:
+            return value_format(round(value)) + '--- %'
+        return progress_undefined
+    max_value = max(max_value, 1)           # has to be a positive integer
+
+    def progress_defined(value: float) -> str:
+        return (
+                value_format(round(value))
+                + f'{round(100 * value / max_value):>3d} %')
+    return progress_defined
+
+
+_pygments: Optional[Tuple[Callable[..., str], object, object]] = None
+_pygments_tried = False
+
+
+def _get_pygments() -> Optional[Tuple[Callable[..., str], object, object]]:
+    """Get the pygments highlight function, lexer and formatter.
+
+    The objects are created only once and shared by subsequent calls.
+
+    Returns:
+        tuple (highlight, lexer, formatter) or None if pygments is not
+        available
+    """
+    global _pygments, _pygments_tried
+
+    if not _pygments_tried:
+        _pygments_tried = True
+        try:
+            from pygments import highlight
+            from pygments.lexers.python import PythonLexer
+            from pygments.formatters.terminal256 import Terminal256Formatter
+        except ImportError:
+            return None
+        _pygments = highlight, PythonLexer(), Terminal256Formatter()
+    return _pygments
+
+
 def pformat(obj: object, color: bool = True) -> str:
     """Format object for better human readable printing.
 
@@ -194,14 +329,10 @@ def pformat(obj: object, color: bool = True) -> str:
     """
     formated = pprint.pformat(obj)
     if color:
-        try:
-            from pygments import highlight
-            from pygments.lexers.python import PythonLexer
-            lexer = PythonLexer()
-            from pygments.formatters.terminal256 import Terminal256Formatter
-            formatter = Terminal256Formatter()
-        except ImportError:
+        pygments_objects = _get_pygments()
+        if pygments_objects is None:
             return formated
+        highlight, lexer, formatter = pygments_objects
         formated = highlight(formated, lexer, formatter)
     return formated
 
@@ -2,28 +2,137 @@
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import Iterable
+from typing import Iterable, cast
+
+
+def compile_patterns(
+        patterns: Iterable[re.Pattern[str] | str]) -> list[re.Pattern[str]]:
+    """Compile regular expressions which are not compiled yet.
+
+    Use this to compile the patterns once when matching many strings
+    against the same patterns.
+
+    Args:
+        patterns: regular expressions as strings or compiled patterns
+
+    Returns:
+        list of compiled patterns
+
+    Examples:
+        >>> compile_patterns(['foo', re.compile('bar')])
+        [re.compile('foo'), re.compile('bar')]
+    """
+    return [
+            pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+            for pattern in patterns]
 
 
 def first_fullmatch(
         patterns: Iterable[re.Pattern[str] | str], string: str) -> re.Match[str] | None:
     """Return the first fullmatch of a string.
 
+    String patterns are compiled on every call. When matching many strings
+    against the same patterns, compile them once using compile_patterns().
+
     Args:
+        patterns: regular expressions as compiled patterns or strings
         string: string to match
-        regexes: list of compiled regular expressions
 
     Returns:
         The first fullmatch of the string or None if no match is found.
 
     Examples:
-        >>> first_fullmatch('foo', [re.compile('foo'), re.compile('bar')])
+        >>> first_fullmatch([re.compile('foo'), re.compile('bar')], 'foo')
         <re.Match object; span=(0, 3), match='foo'>
 
-        >>> first_fullmatch('baz', [re.compile('bar'), re.compile('foo')])
+        >>> first_fullmatch(['bar', 'ba.'], 'baz')
+        <re.Match object; span=(0, 3), match='baz'>
+
+        >>> first_fullmatch([re.compile('bar'), re.compile('foo')], 'baz')
     """
     for pattern in patterns:
-        if match := re.fullmatch(pattern, string):
+        if not isinstance(pattern, re.Pattern):
+            pattern = re.compile(pattern)
+        if match := pattern.fullmatch(string):
             return match
     return None
+
+
+_DEFAULT_FLAGS = re.compile('').flags
+"""Flags of a string pattern compiled without any flags."""
+
+
+@functools.lru_cache(maxsize=128)
+def _fused_pattern(
+        patterns: tuple[re.Pattern[str] | str, ...]) -> re.Pattern[str] | None:
+    """Compile patterns into a single alternation with a named group each.
+
+    Returns:
+        the combined pattern or None if the patterns cannot be combined
+    """
+    if any(
+            isinstance(pattern, re.Pattern) and pattern.flags != _DEFAULT_FLAGS
+            for pattern in patterns):
+        return None
+    try:
+        return re.compile('|'.join(
+                f'(?P<_p{index}>'
+                f'{pattern.pattern if isinstance(pattern, re.Pattern) else pattern})'
+                for index, pattern in enumerate(patterns)))
+    except re.error:
+        return None
+
+
+def first_fullmatch_fused(
+        patterns: Iterable[re.Pattern[str] | str], string: str) -> int | None:
+    """Return the index of the first pattern fully matching a string.
+
+    The patterns are combined into a single regular expression so the string
+    is matched by the regex engine just once. The combined expression is
+    cached for the same sequence of patterns.
+
+    Patterns which cannot be combined are matched one by one like in
+    `first_fullmatch()`. This happens when the patterns use the same group
+    name, when a pattern starts with global inline flags like (?i) (use
+    the scoped form (?i:...) instead) or when a compiled pattern has flags.
+    Numbered backreferences in the patterns do not work because the group
+    numbers change in the combined expression.
+
+    Args:
+        patterns: regular expressions as compiled patterns or strings
+        string: string to match
+
+    Returns:
+        index of the first matching pattern or None if no pattern matches
+
+    Examples:
+        >>> first_fullmatch_fused(['bar', 'ba.', 'baz'], 'baz')
+        1
+
+        >>> first_fullmatch_fused([re.compile('foo'), 'ba+'], 'baaa')
+        1
+
+        >>> first_fullmatch_fused(['bar', 'foo'], 'baz')
+
+        Patterns which cannot be combined:
+
+        >>> first_fullmatch_fused(['(?P<x>a)', '(?P<x>b)'], 'b')
+        1
+        >>> first_fullmatch_fused(['foo', '(?i)bar'], 'BAR')
+        1
+        >>> first_fullmatch_fused(['foo', re.compile('bar', re.I)], 'BAR')
+        1
+    """
+    patterns = tuple(patterns)
+    fused_pattern = _fused_pattern(patterns)
+    if fused_pattern is None:
+        for index, pattern in enumerate(compile_patterns(patterns)):
+            if pattern.fullmatch(string):
+                return index
+        return None
+    match = fused_pattern.fullmatch(string)
+    if match is None:
+        return None
+    return int(cast(str, match.lastgroup)[2:])
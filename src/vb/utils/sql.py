@@ -7,15 +7,153 @@ Todo:
 
 from __future__ import annotations
 
+import functools
+import numbers
 import sqlite3
 import itertools
-import inspect
 
-from typing import Iterable, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+if TYPE_CHECKING:
+    import numpy
 
 # import pandas as pd
 
 
+def _execute_commands(
+        conn: sqlite3.Connection, commands: Sequence[str]) -> None:
+    """Execute SQL commands without parameters, by a single call if possible.
+
+    `executescript()` commits a pending transaction so it is used only
+    when there is no transaction open.
+    """
+    if len(commands) > 1 and not conn.in_transaction:
+        conn.executescript(';\n'.join(commands))
+    else:
+        for command in commands:
+            conn.execute(command)
+
+
+TUNED_CACHE_SIZE_KIB = 65536
+"""Minimal page cache size (KiB) set by `_ensure_tuned()`."""
+
+
+def _ensure_tuned(conn: sqlite3.Connection) -> None:
+    """Tune the connection for large aggregations unless tuned already.
+
+    Enlarge the page cache and keep the temporary tables and indices
+    (e.g. for sorting) in memory. Larger cache or non-default temp_store
+    set by the user are kept. The temp_store is not changed when temporary
+    objects exist. The settings are not persistent and do not affect
+    durability of the data.
+
+    Examples:
+        >>> conn = sqlite3.connect(':memory:')
+        >>> _ensure_tuned(conn)
+        >>> conn.execute('PRAGMA cache_size').fetchone()[0]
+        -65536
+    """
+    cache_size = conn.execute('PRAGMA cache_size').fetchone()[0]
+    if cache_size < 0:                  # negative size is in KiB
+        cache_size_kib = -cache_size
+    else:                               # positive size is in pages
+        cache_size_kib = (
+                cache_size
+                * conn.execute('PRAGMA page_size').fetchone()[0] // 1024)
+    if cache_size_kib < TUNED_CACHE_SIZE_KIB:
+        conn.execute(f'PRAGMA cache_size = {-TUNED_CACHE_SIZE_KIB}')
+    # Change of temp_store deletes all the temporary objects and it is
+    # not allowed in a transaction.
+    if (
+            conn.execute('PRAGMA temp_store').fetchone()[0] == 0  # DEFAULT
+            and not conn.in_transaction
+            and conn.execute(
+                'SELECT 1 FROM temp.sqlite_master LIMIT 1').fetchone() is None):
+        conn.execute('PRAGMA temp_store = MEMORY')
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote SQL identifier.
+
+    Examples:
+        >>> print(_quote_identifier('temp_a"b'))
+        "temp_a""b"
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_literal(value: str | int | float) -> str:
+    """Return SQL literal of a value.
+
+    Numbers of other types (e.g. NumPy scalars) are accepted too.
+
+    Examples:
+        >>> print(_sql_literal(3), _sql_literal("it's"))
+        3 'it''s'
+        >>> import numpy as np
+        >>> print(*(_sql_literal(value) for value in np.array([1, 2])))
+        1 2
+        >>> _sql_literal(np.float32(0.5))
+        '0.5'
+    """
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):
+        return repr(float(value))
+    raise TypeError(f'Unsupported type of SQL literal: {type(value)}')
+
+
+def _index_command(table_name: str, column: str) -> str:
+    """Return SQL command creating an index on a single column of a table.
+
+    Examples:
+        >>> _index_command('meas_pivot', 'time')
+        'CREATE INDEX IF NOT EXISTS "meas_pivot_time_idx" ON "meas_pivot"("time")'
+    """
+    return (
+            f'CREATE INDEX IF NOT EXISTS "{table_name}_{column}_idx" '
+            f'ON "{table_name}"("{column}")')
+
+
+def _analyze_command(table_name: str) -> str:
+    """Return SQL command gathering query planner statistics of a table.
+
+    Examples:
+        >>> _analyze_command('meas_pivot')
+        'ANALYZE "meas_pivot"'
+    """
+    return f'ANALYZE "{table_name}"'
+
+
+def _pivot_tuples(
+        pivot_values: Iterable[str | int],
+        pivoted_value_columns: Iterable[str],
+        ) -> tuple[tuple[str | int, ...], tuple[str, ...]]:
+    """Return the pivot arguments as tuples, check they are not empty.
+
+    Raises:
+        ValueError: if any of the iterables is empty
+
+    Examples:
+        >>> _pivot_tuples(iter([1, 2]), ['temp'])
+        ((1, 2), ('temp',))
+
+        >>> _pivot_tuples([], ['temp'])
+        Traceback (most recent call last):
+        ...
+        ValueError: No pivot values given.
+    """
+    pivot_values = tuple(pivot_values)
+    if not pivot_values:
+        raise ValueError('No pivot values given.')
+    pivoted_value_columns = tuple(pivoted_value_columns)
+    if not pivoted_value_columns:
+        raise ValueError('No pivoted value columns given.')
+    return pivot_values, pivoted_value_columns
+
+
 def pivot_view(
         conn: sqlite3.Connection,
         table_name: str,
@@ -25,7 +163,10 @@ def pivot_view(
         group_by_column: str,
         pivot_view_name: str = '',
         temporary: bool = True,
-        aggreg_function: str = 'MAX') -> str:
+        aggreg_function: str = 'MAX',
+        materialized: bool = False,
+        tune: bool = True,
+        analyze: bool = True) -> str:
     """Create a view that pivots a table.
 
     pivot_values is a list of values to pivot on. Every value in the list
@@ -37,7 +178,6 @@ def pivot_view(
     original rows.
 
     Fixme:
-        * Fix/add examples.
         * Recreate to return SQL command instead of executing it.
 
     Args:
@@ -46,7 +186,9 @@ def pivot_view(
         pivot_column: name of the column to pivot by - Its values listed in
             pivot_values will create columns in the pivoted table.
         pivot_values: values of the pivot_column to pivot
-            Other values are ignored.
+            Other values are ignored. The values are inserted into
+            the SQL command as literals (strings are quoted) because
+            SQLite does not allow parameters in views.
         pivoted_value_columns: columns to be multiplied by pivot_values
             Every column in this list will be represented by one column for
             every value in pivot_values. The created columns are named:
@@ -58,46 +200,187 @@ def pivot_view(
         pivot_view_name: name of the pivot view (_pivot suffix by default)
         temporary: whether the created view should be a temporary one
         aggreg_function: SQL function name to use for aggregation
+        materialized: create a table with an index on group_by_column
+            instead of the view - The aggregation is computed just once
+            so it is faster when the result is queried repeatedly but
+            later changes in the original table are not reflected.
+        tune: enlarge the page cache of the connection and keep temporary
+            data in memory (if not set by the user already)
+        analyze: gather the query planner statistics of the materialized
+            table so the queries joining it can use its index - It can be
+            disabled for small tables.
 
     Returns:
-        name of the pivot view
+        name of the pivot view (or table)
 
     Examples:
-        FIXME: This test has to be completed.
         >>> import sqlite3
         >>> conn = sqlite3.connect(':memory:')
+        >>> _ = conn.execute(
+        ...     'CREATE TABLE meas (time INTEGER, sensor INTEGER, temp REAL)')
+        >>> _ = conn.executemany('INSERT INTO meas VALUES (?, ?, ?)', [
+        ...     (1, 1, 20.5), (1, 2, 21.0), (2, 1, 20.7), (2, 2, 21.3)])
+        >>> pivot_table = pivot_view(conn, 'meas', 'sensor', [1, 2], ['temp'], 'time')
+        >>> pivot_table
+        'meas_pivot'
+        >>> conn.execute(f'SELECT * FROM {pivot_table} ORDER BY time').fetchall()
+        [(1, 20.5, 21.0), (2, 20.7, 21.3)]
+
         >>> pivot_table = pivot_view(
-        ...     conn, 'table_name', 'group_by', 'value_column',
-        ...     'pivot_column', 'pivot_value')
-        >>> conn.execute(       # doctest: +SKIP
-        ...     f'select * from {pivot_table}').fetchall()
-        [(1, 'a', 1), (1, 'a', 2), (1, 'a', 3), (1, 'b', 1), (1, 'b', 2),
-         (1, 'b', 3), (2, 'a', 1), (2, 'a', 2), (2, 'a', 3), (2, 'b', 1),
-         (2, 'b', 2), (2, 'b', 3)]
+        ...     conn, 'meas', 'sensor', [2], ['temp'], 'time',
+        ...     pivot_view_name='meas_pivot_2', materialized=True)
+        >>> conn.execute(f'SELECT * FROM {pivot_table} ORDER BY time').fetchall()
+        [(1, 21.0), (2, 21.3)]
+        >>> conn.execute('SELECT * FROM temp.sqlite_stat1').fetchall()
+        [('meas_pivot_2', 'meas_pivot_2_time_idx', '2 1')]
     """
     if not pivot_view_name:
         pivot_view_name = f'{table_name}_pivot'
+    pivot_values, pivoted_value_columns = _pivot_tuples(
+            pivot_values, pivoted_value_columns)
+    if tune:
+        _ensure_tuned(conn)
+    _execute_commands(conn, _pivot_view_commands(
+            table_name, pivot_column, pivot_values,
+            tuple(map(type, pivot_values)),
+            pivoted_value_columns, group_by_column, pivot_view_name,
+            temporary, aggreg_function, materialized, analyze))
+    # df = pd.read_sql(f'''SELECT * FROM "{pivot_view_name}" LIMIT 10''', conn)
+    # print(df)
+    return pivot_view_name
+
+
+@functools.lru_cache(maxsize=256)
+def _pivot_view_commands(
+        table_name: str,
+        pivot_column: str,
+        pivot_values: tuple[str | int, ...],
+        pivot_value_types: tuple[type, ...],
+        pivoted_value_columns: tuple[str, ...],
+        group_by_column: str,
+        pivot_view_name: str,
+        temporary: bool,
+        aggreg_function: str,
+        materialized: bool,
+        analyze: bool) -> tuple[str, ...]:
+    """Return SQL commands creating the pivot view for pivot_view().
+
+    pivot_value_types is not used in the function. It is a part of the cache
+    key because equal values of different types (e.g. 1, 1.0 and True) give
+    different column names.
+    """
     temporary_cmd = 'TEMPORARY' if temporary else ''
-    pivot_col_cmds: list[str] = []
-    for pivot_value in pivot_values:
-        pivot_col_cmds.extend(
-            f'''{aggreg_function}("{pivoted_value_column}") '''
-            f'''FILTER (WHERE "{pivot_column}" = {pivot_value}) '''
-            f'''AS {pivoted_value_column}_{pivot_value}'''
-            for pivoted_value_column in pivoted_value_columns)
-    pivot_col_cmds_txt = '\n            , '.join(pivot_col_cmds)
+    pivot_col_cmds_txt = '\n            , '.join(
+            f'''{aggreg_function}("{value_column}") '''
+            f'''FILTER (WHERE "{pivot_column}" = {_sql_literal(pivot_value)}) '''
+            f'''AS {_quote_identifier(f"{value_column}_{pivot_value}")}'''
+            for pivot_value, value_column
+            in itertools.product(pivot_values, pivoted_value_columns))
+    object_cmd = 'TABLE' if materialized else 'VIEW'
     command = f'''
-        CREATE {temporary_cmd} VIEW IF NOT EXISTS "{pivot_view_name}" AS
+        CREATE {temporary_cmd} {object_cmd} IF NOT EXISTS "{pivot_view_name}" AS
+        SELECT
+            "{group_by_column}"
+            , {pivot_col_cmds_txt}
+        FROM "{table_name}"
+        GROUP BY "{group_by_column}"
+        '''
+    if materialized:
+        if analyze:
+            return (
+                    command, _index_command(pivot_view_name, group_by_column),
+                    _analyze_command(pivot_view_name))
+        return command, _index_command(pivot_view_name, group_by_column)
+    return (command,)
+
+
+def pivot_query(
+        table_name: str,
+        pivot_column: str,
+        pivot_values: Iterable[str | int],
+        pivoted_value_columns: Iterable[str],
+        group_by_column: str,
+        aggreg_function: str = 'MAX') -> tuple[str, tuple[str | int, ...]]:
+    """Return SQL query pivoting a table and its parameters.
+
+    The query gives the same rows as the view created by pivot_view() but
+    the pivot values are passed as the query parameters so string values
+    do not need any quoting. Repeated execution of the same query reuses
+    the statement prepared by sqlite3.
+
+    Args:
+        table_name: name of the table to pivot
+        pivot_column: name of the column to pivot by
+        pivot_values: values of the pivot_column to pivot
+        pivoted_value_columns: columns to be multiplied by pivot_values
+            The created columns are named:
+            `{pivoted_value_column}_{pivot_value}`
+        group_by_column: column to group by
+        aggreg_function: SQL function name to use for aggregation
+
+    Returns:
+        tuple (query, parameters) to pass to the execute() method
+
+    Examples:
+        >>> import sqlite3
+        >>> conn = sqlite3.connect(':memory:')
+        >>> _ = conn.execute(
+        ...     'CREATE TABLE meas (time INTEGER, sensor TEXT, temp REAL)')
+        >>> _ = conn.executemany('INSERT INTO meas VALUES (?, ?, ?)', [
+        ...     (1, 'in', 20.5), (1, 'out', 1.0), (2, 'in', 20.7)])
+        >>> query, parameters = pivot_query(
+        ...     'meas', 'sensor', ['in', 'out'], ['temp'], 'time')
+        >>> parameters
+        ('in', 'out')
+        >>> conn.execute(query, parameters).fetchall()
+        [(1, 20.5, 1.0), (2, 20.7, None)]
+
+        Equal pivot values of different types give different column names:
+
+        >>> for pivot_value in 1, 1.0:
+        ...     query, _ = pivot_query('meas', 'sensor', [pivot_value], ['temp'], 'time')
+        ...     print('"temp_1.0"' in query)
+        False
+        True
+    """
+    pivot_values, pivoted_value_columns = _pivot_tuples(
+            pivot_values, pivoted_value_columns)
+    parameters = tuple(
+            pivot_value for pivot_value, _ in itertools.product(
+                pivot_values, pivoted_value_columns))
+    return _pivot_query(
+            table_name, pivot_column, pivot_values,
+            tuple(map(type, pivot_values)), pivoted_value_columns,
+            group_by_column, aggreg_function), parameters
+
+
+@functools.lru_cache(maxsize=256)
+def _pivot_query(
+        table_name: str,
+        pivot_column: str,
+        pivot_values: tuple[str | int, ...],
+        pivot_value_types: tuple[type, ...],
+        pivoted_value_columns: tuple[str, ...],
+        group_by_column: str,
+        aggreg_function: str) -> str:
+    """Return SQL query with parameters for pivot_query().
+
+    pivot_value_types only distinguishes the cache entries, see
+    `_pivot_view_commands()`.
+    """
+    pivot_col_cmds_txt = '\n            , '.join(
+            f'''{aggreg_function}("{value_column}") '''
+            f'''FILTER (WHERE "{pivot_column}" = ?) '''
+            f'''AS {_quote_identifier(f"{value_column}_{pivot_value}")}'''
+            for pivot_value, value_column
+            in itertools.product(pivot_values, pivoted_value_columns))
+    return f'''
         SELECT
             "{group_by_column}"
             , {pivot_col_cmds_txt}
         FROM "{table_name}"
         GROUP BY "{group_by_column}"
         '''
-    conn.execute(command)
-    # df = pd.read_sql(f'''SELECT * FROM "{pivot_view_name}" LIMIT 10''', conn)
-    # print(df)
-    return pivot_view_name
 
 
 def pivot_moving_view(
@@ -111,53 +394,142 @@ def pivot_moving_view(
         pivot_view_name: str = '',
         temporary: bool = True,
         aggreg_function: str = 'AVG',
-        min_aggreg_count: int = 3) -> str:
-    """Create a view that pivots a table and calculates moving averages."""
+        min_aggreg_count: int = 3,
+        materialized: bool = False,
+        min_count_per_column: bool = False,
+        tune: bool = True,
+        analyze: bool = True) -> str:
+    """Create a view that pivots a table and calculates moving averages.
+
+    Args:
+        conn: connection to the database
+        table_name: name of the table to pivot
+        pivot_column: name of the column to pivot by
+        pivot_values: values of the pivot_column to pivot
+        pivoted_value_columns: columns to be multiplied by pivot_values
+            The created columns are named:
+            `{pivoted_value_column}_{aggreg_function}_{pivot_value}` and
+            `{pivoted_value_column}_cnt_{pivot_value}` (the count columns
+            are not created with min_count_per_column)
+        window_column: column defining the moving window
+        window_size: range of the window_column values preceding and
+            following the current row
+        pivot_view_name: name of the view (_m_avg suffix by default)
+        temporary: whether the created view should be a temporary one
+        aggreg_function: SQL function name to use for aggregation
+            It has to ignore NULL values like the built-in aggregate
+            functions do.
+        min_aggreg_count: minimal number of aggregated values in every
+            created column to include the row
+        materialized: create a table with an index on window_column
+            instead of the view
+        min_count_per_column: instead of excluding the rows where any
+            column has less than min_aggreg_count values, set just
+            the individual aggregated values to NULL - It is faster
+            because the count columns and the row filter are not needed.
+        tune: enlarge the page cache of the connection and keep temporary
+            data in memory (if not set by the user already)
+        analyze: gather the query planner statistics of the materialized
+            table
+
+    Returns:
+        name of the view (or table)
+    """
     if not pivot_view_name:
         pivot_view_name = f'{table_name}_m_avg'
+    pivot_values, pivoted_value_columns = _pivot_tuples(
+            pivot_values, pivoted_value_columns)
+    if tune:
+        _ensure_tuned(conn)
+    _execute_commands(conn, _pivot_moving_view_commands(
+            table_name, pivot_column, pivot_values,
+            tuple(map(type, pivot_values)),
+            pivoted_value_columns, window_column, tuple(window_size),
+            pivot_view_name, temporary, aggreg_function, min_aggreg_count,
+            materialized, min_count_per_column, analyze))
+    # df = pd.read_sql(f'''SELECT * FROM "{pivot_view_name}" LIMIT 10''', conn)
+    # print(df)
+    return pivot_view_name
+
+
+@functools.lru_cache(maxsize=256)
+def _pivot_moving_view_commands(
+        table_name: str,
+        pivot_column: str,
+        pivot_values: tuple[str | int, ...],
+        pivot_value_types: tuple[type, ...],
+        pivoted_value_columns: tuple[str, ...],
+        window_column: str,
+        window_size: tuple[int, int],
+        pivot_view_name: str,
+        temporary: bool,
+        aggreg_function: str,
+        min_aggreg_count: int,
+        materialized: bool,
+        min_count_per_column: bool,
+        analyze: bool) -> tuple[str, ...]:
+    """Return SQL commands creating the view for pivot_moving_view().
+
+    pivot_value_types only distinguishes the cache entries, see
+    `_pivot_view_commands()`.
+    """
     temporary_cmd = 'TEMPORARY' if temporary else ''
+    # Rows with the same window_column value (one per pivot value) share
+    # the window frame so they are identical and DISTINCT keeps just one.
     pivot_col_cmds = []
     pivot_col_cnt_cmds = []
     pivot_col_cnt_conditions = []
-    for pivot_value in pivot_values:
-        for pivoted_value_column in pivoted_value_columns:
-            column_template = (
-                f'''{{aggreg_function}}("{pivoted_value_column}") '''
-                f'''FILTER (WHERE "{pivot_column}" = {pivot_value}) '''
-                f'''OVER pivot_window '''
-                f'''AS {pivoted_value_column}_{{col_suffix}}_{pivot_value}''')
-            pivot_col_cmds.append(column_template.format(
-                    aggreg_function=aggreg_function,
-                    col_suffix=aggreg_function.lower()))
-            pivot_col_cnt_cmds.append(column_template.format(
-                    aggreg_function='COUNT', col_suffix='cnt'))
-            pivot_col_cnt_conditions.append(
-                f'{pivoted_value_column}_cnt_{pivot_value} '
-                f'>= {min_aggreg_count}')
-    pivot_col_cmds_txt = '\n                , '.join(pivot_col_cmds)
-    pivot_col_cnt_cmds_txt = '\n                , '.join(pivot_col_cnt_cmds)
+    col_suffix = aggreg_function.lower()
+    for pivot_value, value_column in itertools.product(
+            pivot_values, pivoted_value_columns):
+        # CASE is faster than FILTER in window functions. NULLs from
+        # the other pivot values are ignored by the aggregate functions.
+        filtered_window = (
+                f'''(CASE WHEN "{pivot_column}" = {_sql_literal(pivot_value)} '''
+                f'''THEN "{value_column}" END) OVER pivot_window''')
+        aggreg_column = f'{aggreg_function}{filtered_window}'
+        if min_count_per_column:
+            aggreg_column = (
+                    f'CASE WHEN COUNT{filtered_window} >= {min_aggreg_count} '
+                    f'THEN {aggreg_column} END')
+        pivot_col_cmds.append(
+                f'''{aggreg_column} AS '''
+                f'''{_quote_identifier(
+                    f"{value_column}_{col_suffix}_{pivot_value}")}''')
+        if min_count_per_column:
+            continue
+        cnt_column = _quote_identifier(f'{value_column}_cnt_{pivot_value}')
+        pivot_col_cnt_cmds.append(f'COUNT{filtered_window} AS {cnt_column}')
+        pivot_col_cnt_conditions.append(f'{cnt_column} >= {min_aggreg_count}')
+    pivot_col_cmds_txt = '\n                , '.join(
+            pivot_col_cmds + pivot_col_cnt_cmds)
+    where_cmd = (
+            f"WHERE {' AND '.join(pivot_col_cnt_conditions)}"
+            if pivot_col_cnt_conditions else '')
+    object_cmd = 'TABLE' if materialized else 'VIEW'
     command = f'''
-        CREATE {temporary_cmd} VIEW IF NOT EXISTS "{pivot_view_name}" AS
+        CREATE {temporary_cmd} {object_cmd} IF NOT EXISTS "{pivot_view_name}" AS
         WITH pivot_ungrouped AS (
             SELECT
                 "{window_column}"
                 , {pivot_col_cmds_txt}
-                , {pivot_col_cnt_cmds_txt}
             FROM "{table_name}"
             WINDOW pivot_window AS (
                 ORDER BY "{window_column}"
                 RANGE BETWEEN
                     {window_size[0]} PRECEDING AND
                     {window_size[1]} FOLLOWING))
-        SELECT * FROM pivot_ungrouped
-        WHERE {' AND '.join(pivot_col_cnt_conditions)}
-        GROUP BY "{window_column}"
+        SELECT DISTINCT * FROM pivot_ungrouped
+        {where_cmd}
         '''
     # print(command)            # DEBUG
-    conn.execute(command)
-    # df = pd.read_sql(f'''SELECT * FROM "{pivot_view_name}" LIMIT 10''', conn)
-    # print(df)
-    return pivot_view_name
+    if materialized:
+        if analyze:
+            return (
+                    command, _index_command(pivot_view_name, window_column),
+                    _analyze_command(pivot_view_name))
+        return command, _index_command(pivot_view_name, window_column)
+    return (command,)
 
 
 def consec_diff_view(
@@ -165,7 +537,11 @@ def consec_diff_view(
         table_name: str,
         diff_column: str,
         diff_view_name: str = '',
-        temporary: bool = True) -> str:
+        temporary: bool = True,
+        order_column: str | None = None,
+        create_index: bool = False,
+        tune: bool = True,
+        analyze: bool = True) -> str:
     """Create a view adding differences between consecutive values of a column.
 
     Args:
@@ -173,6 +549,16 @@ def consec_diff_view(
         table_name: name of the table to pivot
         diff_column: name of the column to add the differences of
         diff_view_name: name of the view (_cdiff suffix by default)
+        temporary: whether the created view should be a temporary one
+        order_column: name of the column defining the order of the rows
+            (typically a timestamp), diff_column by default
+        create_index: create an index on order_column of the table
+            (if it does not exist) so the rows do not have to be sorted
+            when the view is queried
+        tune: enlarge the page cache of the connection and keep temporary
+            data in memory (if not set by the user already)
+        analyze: gather the query planner statistics of the table after
+            the index is created
 
     Returns:
         name of the diff view
@@ -180,23 +566,102 @@ def consec_diff_view(
     Examples:
         >>> import sqlite3
         >>> conn = sqlite3.connect(':memory:')
+        >>> _ = conn.execute('CREATE TABLE counter (time INTEGER, value INTEGER)')
+        >>> _ = conn.executemany(
+        ...     'INSERT INTO counter VALUES (?, ?)', [(1, 10), (3, 12), (2, 15)])
+        >>> diff_view_name = consec_diff_view(
+        ...     conn, 'counter', 'value', order_column='time', create_index=True)
+        >>> conn.execute(f'SELECT * FROM {diff_view_name}').fetchall()
+        [(1, 10, None, -5), (2, 15, 5, 3), (3, 12, -3, None)]
     """
     if not diff_view_name:
         diff_view_name = f'{table_name}_cdiff'
+    if tune:
+        _ensure_tuned(conn)
+    _execute_commands(conn, _consec_diff_view_commands(
+            table_name, diff_column, diff_view_name, temporary,
+            order_column or diff_column, create_index, analyze))
+    return diff_view_name
+
+
+@functools.lru_cache(maxsize=256)
+def _consec_diff_view_commands(
+        table_name: str,
+        diff_column: str,
+        diff_view_name: str,
+        temporary: bool,
+        order_column: str,
+        create_index: bool,
+        analyze: bool) -> tuple[str, ...]:
+    """Return SQL commands creating the view for consec_diff_view()."""
     temporary_cmd = 'TEMPORARY' if temporary else ''
     command = f'''
         CREATE {temporary_cmd} VIEW IF NOT EXISTS "{diff_view_name}" AS
         SELECT
             *,
             "{diff_column}" - LAG("{diff_column}")
-                OVER (ORDER BY "{diff_column}") AS "{diff_column}_diff_p1",
+                OVER order_window AS "{diff_column}_diff_p1",
             "{diff_column}" - LEAD("{diff_column}")
-                OVER (ORDER BY "{diff_column}") AS "{diff_column}_diff_n1"
+                OVER order_window AS "{diff_column}_diff_n1"
         FROM "{table_name}"
-        ORDER BY "{diff_column}"
+        WINDOW order_window AS (ORDER BY "{order_column}")
+        ORDER BY "{order_column}"
         '''
-    conn.execute(command)
-    return diff_view_name
+    if create_index:
+        if analyze:
+            return (
+                    _index_command(table_name, order_column),
+                    _analyze_command(table_name), command)
+        return _index_command(table_name, order_column), command
+    return (command,)
+
+
+def consec_diff_array(
+        conn: sqlite3.Connection,
+        table_name: str,
+        diff_column: str,
+        order_column: str | None = None,
+        ) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Return differences between consecutive values of a column as arrays.
+
+    This is a NumPy variant of `consec_diff_view()` for consumers of
+    arrays. The differences are computed by vectorized operations instead
+    of the SQL window functions. Requires the numpy package.
+
+    Args:
+        conn: connection to the database
+        table_name: name of the table
+        diff_column: name of the numeric column to get the differences of
+        order_column: name of the column defining the order of the rows,
+            diff_column by default
+
+    Returns:
+        tuple of float arrays in the order of the rows: differences to
+        the previous values and differences to the next values (like
+        the columns `_diff_p1` and `_diff_n1` of `consec_diff_view()`),
+        NULL values and missing neighbours give NaN
+
+    Examples:
+        >>> import sqlite3
+        >>> conn = sqlite3.connect(':memory:')
+        >>> _ = conn.execute('CREATE TABLE counter (time INTEGER, value INTEGER)')
+        >>> _ = conn.executemany(
+        ...     'INSERT INTO counter VALUES (?, ?)', [(1, 10), (3, 12), (2, 15)])
+        >>> diff_p1, diff_n1 = consec_diff_array(conn, 'counter', 'value', 'time')
+        >>> diff_p1.tolist(), diff_n1.tolist()
+        ([nan, 5.0, -3.0], [-5.0, 3.0, nan])
+    """
+    import numpy as np                  # optional dependency
+
+    values = np.array(conn.execute(
+            f'SELECT "{diff_column}" FROM "{table_name}" '
+            f'ORDER BY "{order_column or diff_column}"').fetchall(),
+            dtype=np.float64).reshape(-1)    # NULL values become NaN
+    diff_p1 = np.full_like(values, np.nan)
+    diff_n1 = np.full_like(values, np.nan)
+    np.subtract(values[1:], values[:-1], out=diff_p1[1:])
+    np.subtract(values[:-1], values[1:], out=diff_n1[:-1])
+    return diff_p1, diff_n1
 
 
 def diff_view(
@@ -269,8 +734,8 @@ def many_columns_condition(
         '"a" = 2 AND "b" = 2'
     """
     quote = '"' if quote_columns else ''
-    return f' {bool_op} '.join(
-            f'{quote}{col}{quote} {comparison}' for col in columns)
+    return f' {bool_op} '.join([
+            f'{quote}{col}{quote} {comparison}' for col in columns])
 
 
 def order_by_columns(
@@ -294,15 +759,31 @@ def order_by_columns(
 
         >>> order_by_columns(('a', 'b', 'c'), (None, True))
         'ORDER BY "a", "b" DESC, "c"'
+
+        >>> order_by_columns(('a',), (True, True))
+        'ORDER BY "a" DESC'
     """
     quote = '"' if quote_columns else ''
     if not columns:
         return ''
     if clause:
         clause += ' '
-    return clause + ', '.join(
-            f'{quote}{col}{quote}{" DESC" if rev else ""}'
-            for col, rev in itertools.zip_longest(columns, reverse))
+    reverse = tuple(reverse)
+    reverse_len = len(reverse)
+    return clause + ', '.join([
+            f'{quote}{col}{quote}'
+            f'{" DESC" if index < reverse_len and reverse[index] else ""}'
+            for index, col in enumerate(columns)])
+
+
+_QUERY_EXTREME_TEMPLATE = (
+        'SELECT {columns}\n'
+        'FROM {table}\n'
+        'WHERE {extreme_column} = (\n'
+        '    SELECT {extreme_func}({extreme_column})\n'
+        '    FROM {table})'
+        '{order_by}')
+"""Template of the query_extreme() query."""
 
 
 def query_extreme(
@@ -343,15 +824,29 @@ def query_extreme(
             FROM "table")
         ORDER BY "a", "b"
     """
+    return _query_extreme(
+            table, extreme_column, extreme_func, tuple(order_columns),
+            tuple(reverse), quote_identifiers)
+
+
+@functools.lru_cache(maxsize=256)
+def _query_extreme(
+        table: str,
+        extreme_column: str,
+        extreme_func: str,
+        order_columns: tuple[str, ...],
+        reverse: tuple[bool | None, ...],
+        quote_identifiers: bool) -> str:
+    """Return SQL query for query_extreme()."""
     quote = '"' if quote_identifiers else ''
-    return inspect.cleandoc(
-            f'''
-            SELECT {', '.join(f'{quote}{col}{quote}' for col
-                    in itertools.chain(order_columns, (extreme_column,)))}
-            FROM {quote}{table}{quote}
-            WHERE {quote}{extreme_column}{quote} = (
-                SELECT {extreme_func}({quote}{extreme_column}{quote})
-                FROM {quote}{table}{quote})
-            {order_by_columns(
-                    order_columns, reverse, quote_columns=quote_identifiers)}
-            ''')
+    quoted_table = f'{quote}{table}{quote}'
+    quoted_extreme_column = f'{quote}{extreme_column}{quote}'
+    selected_columns = ', '.join([
+            *(f'{quote}{col}{quote}' for col in order_columns),
+            quoted_extreme_column])
+    order_by = order_by_columns(
+            order_columns, reverse, quote_columns=quote_identifiers)
+    return _QUERY_EXTREME_TEMPLATE.format(
+            columns=selected_columns, table=quoted_table,
+            extreme_column=quoted_extreme_column, extreme_func=extreme_func,
+            order_by=f'\n{order_by}' if order_by else '')